@@ -61,3 +61,23 @@ jwtgen uuid
 echo ""
 echo "11) Generar múltiples UUID v4"
 jwtgen uuid -n 3 --upper --no-hyphen
+
+echo ""
+echo "12) Validar llaves de todos los profiles"
+jwtgen validate-config -c $CONFIG
+
+echo ""
+echo "13) Extraer claims de JWT en un log"
+jwtgen decode gateway.log --claims sub,exp,aud --stats --no-records
+
+echo ""
+echo "14) JWT con jti UUID v7"
+jwtgen sign -c $CONFIG -e $ENV -p $PROFILE --sub test --jti uuid7 --print-payload
+
+echo ""
+echo "15) Generar UUID v7"
+jwtgen uuid --version 7 -n 3
+
+echo ""
+echo "16) Modo co-proceso (una solicitud JSON por línea)"
+echo '{"id": 1, "sub": "test"}' | jwtgen sign --stdio -c $CONFIG -e $ENV -p $PROFILE
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional
+
+from jwtgen.config.loader import ConfigLoader, ConfigError, ResolvedProfile
+from jwtgen.crypto.key_material import KeyMaterialError, check_alg_matches_key, verify_key_pair
+from jwtgen.crypto.key_sources import load_key_material_from_references
+
+
+@dataclass(frozen=True)
+class ProfileValidationResult:
+    env: str
+    profile: str
+    ok: bool
+    elapsed_ms: float
+    error: Optional[str] = None
+
+
+def validate_resolved_profile(resolved: ResolvedProfile) -> ProfileValidationResult:
+    """
+    Valida las llaves de un profile:
+    - lee y carga certificado y llave privada (inline, archivo o variable de ambiente)
+    - verifica que el certificado corresponda a la llave privada
+    - verifica que alg sea compatible con el tipo de llave
+    Función de módulo para poder ejecutarse en un pool de procesos.
+    """
+    start = time.perf_counter()
+    error: Optional[str] = None
+
+    try:
+        keys = load_key_material_from_references(
+            public_cer=resolved.public_cer,
+            private_pem=resolved.private_pem,
+        )
+        verify_key_pair(keys)
+        check_alg_matches_key(resolved.alg, keys.private_key)
+    except KeyMaterialError as e:
+        error = str(e)
+
+    elapsed_ms = (time.perf_counter() - start) * 1000.0
+    return ProfileValidationResult(
+        env=resolved.env_name,
+        profile=resolved.profile_name,
+        ok=error is None,
+        elapsed_ms=elapsed_ms,
+        error=error,
+    )
+
+
+class ConfigValidationService:
+    """
+    Valida todos los profiles de un archivo de configuración en una sola pasada.
+    Errores de schema de un profile se reportan como ok=False junto a los de
+    llaves; la carga de llaves (costosa) se reparte en un pool de procesos.
+    """
+
+    def __init__(self, workers: Optional[int] = None) -> None:
+        self._workers = workers or os.cpu_count() or 1
+
+    def validate(self, config_path: str) -> List[ProfileValidationResult]:
+        loader = ConfigLoader(config_path)
+        raw_profiles = loader.list_raw_profiles()
+        if not raw_profiles:
+            raise ConfigError(f"No hay profiles configurados en: {config_path}")
+
+        results: List[ProfileValidationResult] = []
+        profiles: List[ResolvedProfile] = []
+        for raw in raw_profiles:
+            start = time.perf_counter()
+            try:
+                profiles.append(loader.resolve_raw(raw))
+            except ConfigError as e:
+                results.append(ProfileValidationResult(
+                    env=raw.env_name,
+                    profile=raw.profile_name,
+                    ok=False,
+                    elapsed_ms=(time.perf_counter() - start) * 1000.0,
+                    error=str(e),
+                ))
+
+        results.extend(self._validate_keys(profiles))
+        return sorted(results, key=lambda r: (r.env, r.profile))
+
+    def _validate_keys(self, profiles: List[ResolvedProfile]) -> List[ProfileValidationResult]:
+        workers = min(self._workers, len(profiles))
+        if workers <= 1:
+            return [validate_resolved_profile(p) for p in profiles]
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunksize = max(1, len(profiles) // (workers * 4))
+            return list(pool.map(validate_resolved_profile, profiles, chunksize=chunksize))
@@ -15,4 +15,7 @@ class SignJwtRequest:
     ttl: Optional[str] = None
     exp: Optional[int] = None
     extra_claims: Dict[str, Any] = field(default_factory=dict)
-    payload_template: Optional[str] = None
\ No newline at end of file
+    payload_template: Optional[str] = None
+    compact: bool = False
+    compress: bool = False
+    jti: Optional[str] = None
@@ -1,15 +1,24 @@
 from __future__ import annotations
 
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
 from jwtgen.application.dto import SignJwtRequest
-from jwtgen.config.loader import ConfigLoader, ConfigError
-from jwtgen.crypto.key_material import load_key_material_from_inline, KeyMaterialError
-from jwtgen.crypto.signer import Rs256JwtSigner, JwtSignError, SignResult
+from jwtgen.application.metrics import MetricsRegistry
+from jwtgen.common.file_cache import FileStatCache
+from jwtgen.config.loader import ConfigLoader, ConfigError, ResolvedProfile
+from jwtgen.crypto.key_material import KeyMaterial, KeyMaterialError, load_key_material
+from jwtgen.crypto.key_sources import read_key_reference
+from jwtgen.crypto.signer import CompactOptions, Rs256JwtSigner, JwtSignError, SignResult
 from jwtgen.domain.claims import (
     StandardClaimsInput,
     build_standard_claims,
     ClaimError,
     render_payload_from_template,
 )
+from jwtgen.domain.identifiers import IdentifierError, generate_jti
+from jwtgen.domain.payload_skeleton import PayloadSkeleton
 from jwtgen.domain.templates import PayloadTemplateRepository, TemplateError
 
 
@@ -18,13 +27,164 @@ class JwtServiceError(Exception):
 
 
 class JwtService:
-    def __init__(self) -> None:
+    def __init__(self, metrics: Optional[MetricsRegistry] = None) -> None:
         self._signer = Rs256JwtSigner()
         self._templates = PayloadTemplateRepository()
+        self._configs: FileStatCache[ConfigLoader] = FileStatCache()
+        self._keys: Dict[Tuple[bytes, bytes], KeyMaterial] = {}
+        self._key_hits = 0
+        self._key_misses = 0
+
+        self._metrics = metrics
+        if metrics is not None:
+            metrics.register_cache_source(self.cache_stats)
+
+    def cache_stats(self) -> Dict[str, Tuple[int, int]]:
+        """
+        (hits, misses) de las caches de config, template y llaves.
+        """
+        return {
+            "config": (self._configs.hits, self._configs.misses),
+            "template": self._templates.cache_stats(),
+            "key": (self._key_hits, self._key_misses),
+        }
 
     def sign_rs256(self, req: SignJwtRequest) -> SignResult:
+        if self._metrics is None:
+            return self._sign_rs256(req)
+
+        started = time.perf_counter()
+        try:
+            result = self._sign_rs256(req)
+        except JwtServiceError as e:
+            self._record_error(req, e)
+            raise
+        self._metrics.record_issued(req.env, req.profile, time.perf_counter() - started)
+        return result
+
+    def sign_rs256_batch(self, requests: Sequence[SignJwtRequest]) -> List[SignResult]:
+        """
+        Firma varios tokens. Las solicitudes que comparten config/env/profile/iss/aud/
+        template/modo y nombres de claims extra se agrupan: config, template y llaves se
+        resuelven una vez y el payload se arma desde un PayloadSkeleton, serializando
+        por token solo sub/iat/exp y los claims extra.
+        Con --compress se usa el camino normal por token. En lote no se calcula size_report.
+        """
+        results: List[Optional[SignResult]] = [None] * len(requests)
+        groups: Dict[Tuple[Any, ...], List[int]] = {}
+        for i, req in enumerate(requests):
+            groups.setdefault(_batch_shape(req), []).append(i)
+
+        for indexes in groups.values():
+            first = requests[indexes[0]]
+            if first.compress:
+                for i in indexes:
+                    results[i] = self.sign_rs256(requests[i])
+                continue
+
+            try:
+                group = self._prepare_batch_group(first)
+            except JwtServiceError as e:
+                self._record_error(first, e)
+                raise
+
+            for i in indexes:
+                req = requests[i]
+                started = time.perf_counter()
+                try:
+                    results[i] = self._sign_from_skeleton(req, *group)
+                except JwtServiceError as e:
+                    self._record_error(req, e)
+                    raise
+                if self._metrics is not None:
+                    self._metrics.record_issued(req.env, req.profile, time.perf_counter() - started)
+
+        return [r for r in results if r is not None]
+
+    def _record_error(self, req: SignJwtRequest, error: JwtServiceError) -> None:
+        if self._metrics is None:
+            return
+        # Se registra el tipo de error de origen (ConfigError, KeyMaterialError, ...).
+        cause = error.__cause__ if error.__cause__ is not None else error
+        self._metrics.record_error(req.env, req.profile, type(cause).__name__)
+
+    def _prepare_batch_group(self, req: SignJwtRequest) -> Tuple[ResolvedProfile, PayloadSkeleton, KeyMaterial]:
+        try:
+            resolved = self._config_loader(req.config_path).resolve(env=req.env, profile=req.profile)
+        except ConfigError as e:
+            raise JwtServiceError(str(e)) from e
+
+        template_name = req.payload_template or resolved.payload_template or "generic"
+        try:
+            template = self._templates.load(template_name)
+            aliases = self._templates.load_aliases(template_name) if req.compact else {}
+        except TemplateError as e:
+            raise JwtServiceError(str(e)) from e
+
+        try:
+            skeleton = PayloadSkeleton.build(
+                template=template,
+                standard_claims={
+                    "iss": req.iss or resolved.issuer_default,
+                    "aud": req.aud or resolved.audience_default,
+                },
+                variable_claims=tuple(_with_jti(req, placeholder=True).keys()),
+                aliases=aliases,
+                sort_keys=req.compact,
+                ensure_ascii=not req.compact,
+            )
+        except (ClaimError, IdentifierError) as e:
+            raise JwtServiceError(str(e)) from e
+
+        try:
+            keys = self._load_keys(resolved)
+        except KeyMaterialError as e:
+            raise JwtServiceError(str(e)) from e
+
+        return resolved, skeleton, keys
+
+    def _sign_from_skeleton(
+        self,
+        req: SignJwtRequest,
+        resolved: ResolvedProfile,
+        skeleton: PayloadSkeleton,
+        keys: KeyMaterial,
+    ) -> SignResult:
+        try:
+            standard_claims = build_standard_claims(
+                StandardClaimsInput(
+                    iss=req.iss or resolved.issuer_default,
+                    sub=req.sub,
+                    aud=req.aud or resolved.audience_default,
+                    ttl=req.ttl or resolved.default_ttl,
+                    exp=req.exp,
+                )
+            )
+            values = {
+                "sub": standard_claims["sub"],
+                "iat": standard_claims["iat"],
+                "exp": standard_claims["exp"],
+            }
+            values.update(_with_jti(req))
+            segment = skeleton.encode_segment(values)
+        except (ClaimError, IdentifierError) as e:
+            raise JwtServiceError(str(e)) from e
+        except (TypeError, ValueError) as e:
+            raise JwtServiceError(f"Payload no serializable a JSON: {e}") from e
+
+        try:
+            return self._signer.sign_encoded(
+                payload_segment=segment,
+                payload=skeleton.payload_dict(values),
+                keys=keys,
+                kid=None,
+            )
+        except JwtSignError as e:
+            raise JwtServiceError(str(e)) from e
+
+    def _sign_rs256(self, req: SignJwtRequest) -> SignResult:
         try:
-            resolved = ConfigLoader(req.config_path).resolve(env=req.env, profile=req.profile)
+            resolved = self._config_loader(req.config_path).resolve(env=req.env, profile=req.profile)
         except ConfigError as e:
             raise JwtServiceError(str(e)) from e
 
@@ -46,8 +206,14 @@ class JwtService:
             raise JwtServiceError(str(e)) from e
 
         template_name = req.payload_template or resolved.payload_template or "generic"
+        compact = None
         try:
             template = self._templates.load(template_name)
+            if req.compact or req.compress:
+                compact = CompactOptions(
+                    aliases=self._templates.load_aliases(template_name),
+                    compress=req.compress,
+                )
         except TemplateError as e:
             raise JwtServiceError(str(e)) from e
 
@@ -55,20 +221,81 @@ class JwtService:
             payload = render_payload_from_template(
                 template=template,
                 standard_claims=standard_claims,
-                extra_claims=req.extra_claims,
+                extra_claims=_with_jti(req),
             )
-        except ClaimError as e:
+        except (ClaimError, IdentifierError) as e:
             raise JwtServiceError(str(e)) from e
 
         try:
-            keys = load_key_material_from_inline(
-                public_cer_inline=resolved.public_cer,
-                private_pem_inline=resolved.private_pem,
-            )
+            keys = self._load_keys(resolved)
         except KeyMaterialError as e:
             raise JwtServiceError(str(e)) from e
 
         try:
-            return self._signer.sign(payload=payload, keys=keys, kid=None)
+            return self._signer.sign(payload=payload, keys=keys, kid=None, compact=compact)
         except JwtSignError as e:
-            raise JwtServiceError(str(e)) from e
\ No newline at end of file
+            raise JwtServiceError(str(e)) from e
+
+    def _config_loader(self, config_path: str) -> ConfigLoader:
+        """
+        Reutiliza el YAML ya parseado mientras el archivo no cambie en disco.
+        El loader usa la ruta absoluta para que las rutas *_file no dependan del cwd.
+        """
+        path = Path(config_path).resolve()
+        if not path.exists():
+            return ConfigLoader(config_path)
+
+        def _load(_: Path) -> ConfigLoader:
+            loader = ConfigLoader(str(path))
+            loader.load()
+            return loader
+
+        return self._configs.get(path, _load)
+
+    def _load_keys(self, resolved: ResolvedProfile) -> KeyMaterial:
+        """
+        Lee las llaves del profile solo al firmar. El parseo (costoso) se cachea por
+        contenido; los archivos ya vienen cacheados por stat desde read_key_reference.
+        """
+        raw = (read_key_reference(resolved.public_cer), read_key_reference(resolved.private_pem))
+        keys = self._keys.get(raw)
+        if keys is not None:
+            self._key_hits += 1
+            return keys
+
+        keys = load_key_material(public_cer=raw[0], private_key=raw[1])
+        self._key_misses += 1
+        self._keys[raw] = keys
+        return keys
+
+
+def _batch_shape(req: SignJwtRequest) -> Tuple[Any, ...]:
+    """
+    Solicitudes con la misma forma comparten PayloadSkeleton en sign_rs256_batch.
+    """
+    return (
+        req.config_path,
+        req.env,
+        req.profile,
+        req.iss,
+        req.aud,
+        req.payload_template,
+        req.compact,
+        req.compress,
+        req.jti,
+        tuple(req.extra_claims.keys()),
+    )
+
+
+def _with_jti(req: SignJwtRequest, placeholder: bool = False) -> Dict[str, Any]:
+    """
+    Claims extra de la solicitud, con jti generado si se pidió (req.jti = uuid4|uuid7|random128).
+    """
+    if not req.jti:
+        return req.extra_claims
+    if "jti" in req.extra_claims:
+        raise ClaimError("jti definido dos veces: usa --jti o --claim jti=..., no ambos.")
+
+    claims = dict(req.extra_claims)
+    claims["jti"] = None if placeholder else generate_jti(req.jti)
+    return claims
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import os
+import json
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+
+# Límites superiores (segundos) de los buckets de latencia de firma.
+DEFAULT_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# Fuente de estadísticas de cache: nombre -> (hits, misses).
+CacheStatsSource = Callable[[], Dict[str, Tuple[int, int]]]
+
+_LabelKey = Tuple[str, str]
+
+
+# Histograma por shard: [count_bucket_0, ..., count_bucket_+Inf, sum, count].
+_Histogram = List[float]
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels.items()) + "}"
+
+
+class MetricsRegistry:
+    """
+    Métricas acumuladas del pipeline de firma para procesos de larga duración:
+    tokens emitidos por env/profile, errores por tipo, histograma de latencia y
+    ratio de aciertos de caches.
+
+    record_issued (camino caliente) no toma locks: cada hilo escribe en su propio
+    shard de histogramas y snapshot() los suma. Un snapshot concurrente puede ver
+    un registro a medio aplicar (sum/count desfasados en uno), nunca perderlo.
+    Los shards de hilos terminados se acumulan en _retired y se descartan, así
+    su número queda acotado por los hilos vivos.
+    """
+
+    def __init__(self, latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self._buckets = tuple(sorted(latency_buckets))
+        self._hist_size = len(self._buckets) + 3
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, Dict[_LabelKey, _Histogram]]] = []
+        self._retired: Dict[_LabelKey, _Histogram] = {}
+        self._errors: Dict[Tuple[str, str, str], int] = {}
+        self._cache_sources: List[CacheStatsSource] = []
+
+    def record_issued(self, env: str, profile: str, elapsed_seconds: float) -> None:
+        # El contador de tokens emitidos es el count del histograma de latencia.
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+
+        hist = shard.get((env, profile))
+        if hist is None:
+            hist = shard[(env, profile)] = [0] * self._hist_size
+
+        hist[bisect_left(self._buckets, elapsed_seconds)] += 1
+        hist[-2] += elapsed_seconds
+        hist[-1] += 1
+
+    def _new_shard(self) -> Dict[_LabelKey, _Histogram]:
+        shard: Dict[_LabelKey, _Histogram] = {}
+        self._local.shard = shard
+        with self._lock:
+            self._fold_dead_shards()
+            self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _fold_dead_shards(self) -> None:
+        # Requiere self._lock. Un hilo terminado ya no escribe en su shard.
+        alive = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                alive.append((thread, shard))
+                continue
+            for key, hist in shard.items():
+                base = self._retired.get(key)
+                if base is None:
+                    self._retired[key] = list(hist)
+                else:
+                    self._retired[key] = [a + b for a, b in zip(base, hist)]
+        self._shards = alive
+
+    def record_error(self, env: str, profile: str, error_type: str) -> None:
+        key = (env, profile, error_type)
+        with self._lock:
+            self._errors[key] = self._errors.get(key, 0) + 1
+
+    def register_cache_source(self, source: CacheStatsSource) -> None:
+        with self._lock:
+            self._cache_sources.append(source)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            errors = dict(self._errors)
+            self._fold_dead_shards()
+            shards = [dict(self._retired)] + [shard for _, shard in self._shards]
+            sources = list(self._cache_sources)
+
+        latency: Dict[_LabelKey, Tuple[List[int], float, int]] = {}
+        for shard in shards:
+            for key, hist in list(shard.items()):
+                hist = list(hist)
+                counts, total, count = latency.get(key, ([0] * (len(hist) - 2), 0.0, 0))
+                latency[key] = (
+                    [a + b for a, b in zip(counts, hist[:-2])],
+                    total + hist[-2],
+                    count + hist[-1],
+                )
+
+        caches: Dict[str, Dict[str, Any]] = {}
+        for source in sources:
+            for name, (hits, misses) in source().items():
+                entry = caches.setdefault(name, {"hits": 0, "misses": 0})
+                entry["hits"] += hits
+                entry["misses"] += misses
+        for entry in caches.values():
+            lookups = entry["hits"] + entry["misses"]
+            entry["hit_ratio"] = entry["hits"] / lookups if lookups else 0.0
+
+        return {
+            "tokens_issued": [
+                {"env": env, "profile": profile, "count": count}
+                for (env, profile), (_, _, count) in sorted(latency.items())
+            ],
+            "errors": [
+                {"env": env, "profile": profile, "type": error_type, "count": count}
+                for (env, profile, error_type), count in sorted(errors.items())
+            ],
+            "caches": dict(sorted(caches.items())),
+            "sign_latency_seconds": [
+                {
+                    "env": env,
+                    "profile": profile,
+                    "buckets": self._buckets,
+                    "counts": counts,
+                    "sum": total,
+                    "count": count,
+                }
+                for (env, profile), (counts, total, count) in sorted(latency.items())
+            ],
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2, ensure_ascii=False)
+
+    def render_prometheus(self) -> str:
+        snap = self.snapshot()
+        lines: List[str] = []
+
+        lines.append("# HELP jwtgen_tokens_issued_total Tokens firmados por env/profile.")
+        lines.append("# TYPE jwtgen_tokens_issued_total counter")
+        for item in snap["tokens_issued"]:
+            lines.append(
+                f"jwtgen_tokens_issued_total{_labels(env=item['env'], profile=item['profile'])} {item['count']}"
+            )
+
+        lines.append("# HELP jwtgen_sign_errors_total Errores de firma por tipo de excepción.")
+        lines.append("# TYPE jwtgen_sign_errors_total counter")
+        for item in snap["errors"]:
+            labels = _labels(env=item["env"], profile=item["profile"], type=item["type"])
+            lines.append(f"jwtgen_sign_errors_total{labels} {item['count']}")
+
+        lines.append("# HELP jwtgen_cache_hits_total Aciertos de cache.")
+        lines.append("# TYPE jwtgen_cache_hits_total counter")
+        for name, entry in snap["caches"].items():
+            lines.append(f"jwtgen_cache_hits_total{_labels(cache=name)} {entry['hits']}")
+        lines.append("# HELP jwtgen_cache_misses_total Fallos de cache.")
+        lines.append("# TYPE jwtgen_cache_misses_total counter")
+        for name, entry in snap["caches"].items():
+            lines.append(f"jwtgen_cache_misses_total{_labels(cache=name)} {entry['misses']}")
+        lines.append("# HELP jwtgen_cache_hit_ratio Ratio de aciertos de cache.")
+        lines.append("# TYPE jwtgen_cache_hit_ratio gauge")
+        for name, entry in snap["caches"].items():
+            lines.append(f"jwtgen_cache_hit_ratio{_labels(cache=name)} {entry['hit_ratio']}")
+
+        lines.append("# HELP jwtgen_sign_latency_seconds Latencia de firma.")
+        lines.append("# TYPE jwtgen_sign_latency_seconds histogram")
+        for item in snap["sign_latency_seconds"]:
+            env, profile = item["env"], item["profile"]
+            cumulative = 0
+            for bound, count in zip(item["buckets"], item["counts"]):
+                cumulative += count
+                labels = _labels(env=env, profile=profile, le=repr(bound))
+                lines.append(f"jwtgen_sign_latency_seconds_bucket{labels} {cumulative}")
+            labels = _labels(env=env, profile=profile, le="+Inf")
+            lines.append(f"jwtgen_sign_latency_seconds_bucket{labels} {item['count']}")
+            labels = _labels(env=env, profile=profile)
+            lines.append(f"jwtgen_sign_latency_seconds_sum{labels} {item['sum']}")
+            lines.append(f"jwtgen_sign_latency_seconds_count{labels} {item['count']}")
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """
+        Escribe el formato de texto de Prometheus de forma atómica (ej: textfile collector).
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp_path, path)
+
+    def serve_http(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """
+        Expone /metrics (Prometheus) y /metrics.json en un hilo de fondo.
+        Retorna el servidor; usar shutdown() para detenerlo.
+        """
+        registry = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path == "/metrics":
+                    body = registry.render_prometheus().encode("utf-8")
+                    content_type = "text/plain; version=0.0.4; charset=utf-8"
+                elif self.path == "/metrics.json":
+                    body = registry.to_json().encode("utf-8")
+                    content_type = "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, port), _Handler)
+        threading.Thread(target=server.serve_forever, name="jwtgen-metrics", daemon=True).start()
+        return server
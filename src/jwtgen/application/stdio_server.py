@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import fields, replace
+from typing import Any, Dict, Optional, TextIO, Tuple
+
+from jwtgen.application.dto import SignJwtRequest
+from jwtgen.application.jwt_service import JwtService, JwtServiceError
+from jwtgen.crypto.signer import SignResult
+
+
+class StdioRequestError(Exception):
+    def __init__(self, message: str, request_id: Any = None) -> None:
+        super().__init__(message)
+        self.request_id = request_id
+
+
+_REQUEST_FIELDS = {f.name for f in fields(SignJwtRequest)}
+
+# Tipo JSON esperado por campo; null se acepta en todos (y luego se valida si es requerido).
+_FIELD_TYPES: Dict[str, Tuple[type, str]] = {
+    "config_path": (str, "string"),
+    "env": (str, "string"),
+    "profile": (str, "string"),
+    "sub": (str, "string"),
+    "aud": (str, "string"),
+    "iss": (str, "string"),
+    "ttl": (str, "string"),
+    "payload_template": (str, "string"),
+    "jti": (str, "string"),
+    "exp": (int, "integer"),
+    "compact": (bool, "boolean"),
+    "compress": (bool, "boolean"),
+    "extra_claims": (dict, "object"),
+}
+
+
+def _check_field_types(data: Dict[str, Any], request_id: Any) -> None:
+    for name, value in data.items():
+        if value is None:
+            if name in ("compact", "compress", "extra_claims"):
+                raise StdioRequestError(f"Campo '{name}' no puede ser null.", request_id)
+            continue
+        expected, label = _FIELD_TYPES[name]
+        # bool es subclase de int: no aceptar true/false como exp.
+        if not isinstance(value, expected) or (expected is int and isinstance(value, bool)):
+            raise StdioRequestError(f"Campo '{name}' debe ser {label}.", request_id)
+
+
+def parse_request_line(line: str, defaults: SignJwtRequest) -> tuple[Any, SignJwtRequest]:
+    """
+    Convierte una línea JSON en (id, SignJwtRequest). Los campos usan los mismos
+    nombres que SignJwtRequest; los que no vienen se toman de `defaults`.
+    """
+    try:
+        data = json.loads(line)
+    except ValueError as e:
+        raise StdioRequestError(f"JSON inválido: {e}") from e
+    if not isinstance(data, dict):
+        raise StdioRequestError("Cada línea debe ser un JSON object.")
+
+    request_id = data.pop("id", None)
+    unknown = sorted(set(data) - _REQUEST_FIELDS)
+    if unknown:
+        raise StdioRequestError(f"Campos desconocidos: {unknown}", request_id)
+    _check_field_types(data, request_id)
+
+    req = replace(defaults, **data)
+    for name in ("config_path", "env", "profile", "sub"):
+        if not getattr(req, name):
+            raise StdioRequestError(f"Falta campo requerido '{name}'.", request_id)
+    return request_id, req
+
+
+def _ok_response(request_id: Any, result: SignResult) -> Dict[str, Any]:
+    return {"id": request_id, "ok": True, "token": result.token, "payload": result.payload}
+
+
+def _error_response(request_id: Any, error: Exception) -> Dict[str, Any]:
+    return {"id": request_id, "ok": False, "error": str(error)}
+
+
+class StdioSignServer:
+    """
+    Modo co-proceso: lee un SignJwtRequest JSON por línea y escribe un resultado JSON
+    por línea, correlacionado por "id". El proceso (y sus caches de config, templates
+    y llaves) se mantiene vivo hasta EOF.
+
+    Con workers > 1 las solicitudes se firman en paralelo y las respuestas se
+    escriben a medida que terminan (no necesariamente en orden de llegada).
+    """
+
+    def __init__(
+        self,
+        defaults: SignJwtRequest,
+        service: Optional[JwtService] = None,
+        workers: int = 1,
+    ) -> None:
+        self._defaults = defaults
+        self._service = service or JwtService()
+        self._workers = max(1, workers)
+        self._write_lock = threading.Lock()
+
+    def serve(self, stdin: TextIO, stdout: TextIO) -> int:
+        """
+        Procesa hasta EOF y retorna la cantidad de solicitudes atendidas.
+        """
+        if self._workers == 1:
+            count = 0
+            for line in stdin:
+                if line.strip():
+                    self._write(stdout, self._handle(line))
+                    count += 1
+            return count
+
+        # Limita solicitudes en vuelo para no acumular memoria si stdin es más rápido.
+        in_flight = threading.BoundedSemaphore(self._workers * 4)
+
+        def _task(line: str) -> None:
+            try:
+                self._write(stdout, self._handle(line))
+            finally:
+                in_flight.release()
+
+        count = 0
+        with ThreadPoolExecutor(max_workers=self._workers) as pool:
+            for line in stdin:
+                if not line.strip():
+                    continue
+                in_flight.acquire()
+                pool.submit(_task, line)
+                count += 1
+        return count
+
+    def _handle(self, line: str) -> Dict[str, Any]:
+        request_id = None
+        try:
+            request_id, req = parse_request_line(line, self._defaults)
+            return _ok_response(request_id, self._service.sign_rs256(req))
+        except StdioRequestError as e:
+            return _error_response(e.request_id, e)
+        except JwtServiceError as e:
+            return _error_response(request_id, e)
+        except Exception as e:
+            return _error_response(request_id, JwtServiceError(f"Error inesperado: {e}"))
+
+    def _write(self, stdout: TextIO, response: Dict[str, Any]) -> None:
+        text = json.dumps(response, ensure_ascii=False, separators=(",", ":"))
+        with self._write_lock:
+            stdout.write(text + "\n")
+            stdout.flush()
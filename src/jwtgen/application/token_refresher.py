@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import heapq
+import json
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from jwtgen.application.dto import SignJwtRequest
+from jwtgen.application.jwt_service import JwtService, JwtServiceError
+from jwtgen.crypto.signer import SignResult
+
+
+RefreshErrorCallback = Callable[[SignJwtRequest, Exception], None]
+
+_RefreshKey = Tuple[str, str, str, str, Optional[str], Optional[str], Optional[str], Optional[str], bool, bool, Optional[str], str]
+
+
+def _refresh_key(req: SignJwtRequest) -> _RefreshKey:
+    return (
+        req.config_path,
+        req.env,
+        req.profile,
+        req.sub,
+        req.aud,
+        req.iss,
+        req.ttl,
+        req.payload_template,
+        req.compact,
+        req.compress,
+        req.jti,
+        json.dumps(req.extra_claims, sort_keys=True, default=str),
+    )
+
+
+class TokenRefresher:
+    """
+    Mantiene un token vigente por (config, env, profile, sub, claims) y lo vuelve a
+    firmar en un hilo de fondo al cumplirse `refresh_fraction` del TTL (exp - iat).
+
+    get() lee el valor actual sin locks; solo firma en el hilo del llamador la
+    primera vez que se pide una llave o si el token vigente ya expiró. El hilo de
+    fondo se inicia con el primer token registrado (o con start()).
+    Los errores de renovación se reportan vía `on_error` y se reintentan cada
+    `retry_interval` segundos mientras el token anterior siga sirviéndose.
+    """
+
+    def __init__(
+        self,
+        service: Optional[JwtService] = None,
+        refresh_fraction: float = 0.8,
+        retry_interval: float = 5.0,
+        on_error: Optional[RefreshErrorCallback] = None,
+    ) -> None:
+        if not 0.0 < refresh_fraction < 1.0:
+            raise ValueError("refresh_fraction debe estar entre 0 y 1 (exclusivo).")
+        if retry_interval <= 0:
+            raise ValueError("retry_interval debe ser > 0.")
+
+        self._service = service or JwtService()
+        self._refresh_fraction = refresh_fraction
+        self._retry_interval = retry_interval
+        self._on_error = on_error
+
+        self._current: Dict[_RefreshKey, SignResult] = {}
+        self._requests: Dict[_RefreshKey, SignJwtRequest] = {}
+        self._schedule: List[Tuple[float, int, _RefreshKey]] = []
+        self._seq = 0
+
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "TokenRefresher":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name="jwtgen-token-refresher", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        with self._cond:
+            self._stopped = True
+            thread, self._thread = self._thread, None
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join(timeout)
+
+    def get(self, req: SignJwtRequest) -> SignResult:
+        """
+        Retorna el token vigente para la solicitud, registrándola si es nueva.
+        """
+        key = _refresh_key(req)
+        current = self._current.get(key)
+        if current is not None and current.payload["exp"] > time.time():
+            return current
+        return self._sign_now(key, req)
+
+    def discard(self, req: SignJwtRequest) -> None:
+        """
+        Deja de renovar el token de la solicitud.
+        """
+        key = _refresh_key(req)
+        with self._cond:
+            self._requests.pop(key, None)
+            self._current.pop(key, None)
+
+    def _sign_now(self, key: _RefreshKey, req: SignJwtRequest) -> SignResult:
+        if req.exp is not None:
+            raise JwtServiceError("TokenRefresher requiere TTL relativo; un exp absoluto no se puede renovar.")
+
+        result = self._service.sign_rs256(req)
+        with self._cond:
+            self._current[key] = result
+            if key not in self._requests:
+                self._requests[key] = req
+            self._push(self._next_refresh_at(result), key)
+
+        if self._thread is None and not self._stopped:
+            self.start()
+        return result
+
+    def _next_refresh_at(self, result: SignResult) -> float:
+        iat = result.payload["iat"]
+        exp = result.payload["exp"]
+        return iat + (exp - iat) * self._refresh_fraction
+
+    def _push(self, when: float, key: _RefreshKey) -> None:
+        self._seq += 1
+        heapq.heappush(self._schedule, (when, self._seq, key))
+        self._cond.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    if self._schedule:
+                        wait = self._schedule[0][0] - time.time()
+                        if wait <= 0:
+                            break
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+                if self._stopped:
+                    return
+
+                _, _, key = heapq.heappop(self._schedule)
+                req = self._requests.get(key)
+                current = self._current.get(key)
+                if req is None or current is None:
+                    continue
+                if time.time() < self._next_refresh_at(current):
+                    # Ya renovado por otro camino (get con token expirado); hay otra entrada agendada.
+                    continue
+
+            self._refresh(key, req)
+
+    def _refresh(self, key: _RefreshKey, req: SignJwtRequest) -> None:
+        try:
+            result = self._service.sign_rs256(req)
+        except Exception as e:
+            if self._on_error is not None:
+                try:
+                    self._on_error(req, e)
+                except Exception:
+                    pass
+            with self._cond:
+                if key in self._requests:
+                    self._push(time.time() + self._retry_interval, key)
+            return
+
+        with self._cond:
+            if key in self._requests:
+                self._current[key] = result
+                self._push(self._next_refresh_at(result), key)
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import os
+import mmap
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from jwtgen.domain.token_decoding import JWT_BYTES_PATTERN, TokenDecodeError, decode_payload_segment
+
+
+# Largo máximo de un token que cruza el borde entre chunks.
+MAX_TOKEN_BYTES = 64 * 1024
+DEFAULT_CHUNK_BYTES = 64 * 1024 * 1024
+
+
+@dataclass
+class ScanStats:
+    tokens: int = 0
+    invalid: int = 0
+    expired: int = 0
+    without_exp: int = 0
+    exp_histogram: Counter = field(default_factory=Counter)
+    aud_counts: Counter = field(default_factory=Counter)
+
+    def merge(self, other: "ScanStats") -> None:
+        self.tokens += other.tokens
+        self.invalid += other.invalid
+        self.expired += other.expired
+        self.without_exp += other.without_exp
+        self.exp_histogram.update(other.exp_histogram)
+        self.aud_counts.update(other.aud_counts)
+
+    def to_dict(self, bucket_seconds: int) -> Dict[str, Any]:
+        return {
+            "tokens": self.tokens,
+            "invalid": self.invalid,
+            "expired": self.expired,
+            "without_exp": self.without_exp,
+            "exp_histogram": {
+                datetime.fromtimestamp(bucket, tz=timezone.utc).isoformat(): count
+                for bucket, count in sorted(self.exp_histogram.items())
+            },
+            "exp_bucket_seconds": bucket_seconds,
+            "aud_counts": dict(self.aud_counts.most_common()),
+        }
+
+
+@dataclass(frozen=True)
+class _ChunkTask:
+    path: str
+    start: int
+    end: int
+    claims: Tuple[str, ...]
+    now: int
+    bucket_seconds: int
+    collect_records: bool
+
+
+def _scan_chunk(task: _ChunkTask) -> Tuple[List[Dict[str, Any]], ScanStats]:
+    """
+    Escanea [start, end) de un archivo mapeado en memoria. Un token pertenece al
+    chunk donde empieza; se lee hasta MAX_TOKEN_BYTES más allá del borde.
+    Función de módulo para poder ejecutarse en un pool de procesos.
+    """
+    records: List[Dict[str, Any]] = []
+    stats = ScanStats()
+
+    with open(task.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        endpos = min(len(mm), task.end + MAX_TOKEN_BYTES)
+        for m in JWT_BYTES_PATTERN.finditer(mm, task.start, endpos):
+            if m.start() >= task.end:
+                break
+
+            token = m.group(0)
+            first_dot = token.index(b".")
+            second_dot = token.index(b".", first_dot + 1)
+            try:
+                payload = decode_payload_segment(token[first_dot + 1 : second_dot])
+            except TokenDecodeError:
+                stats.invalid += 1
+                continue
+
+            stats.tokens += 1
+            _accumulate(stats, payload, task.now, task.bucket_seconds)
+
+            if task.collect_records:
+                records.append({k: payload[k] for k in task.claims if k in payload})
+
+    return records, stats
+
+
+def _accumulate(stats: ScanStats, payload: Dict[str, Any], now: int, bucket_seconds: int) -> None:
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)) and not isinstance(exp, bool):
+        if exp <= now:
+            stats.expired += 1
+        stats.exp_histogram[int(exp) // bucket_seconds * bucket_seconds] += 1
+    else:
+        stats.without_exp += 1
+
+    aud = payload.get("aud")
+    if isinstance(aud, list):
+        stats.aud_counts.update(str(a) for a in aud)
+    elif aud is not None:
+        stats.aud_counts[str(aud)] += 1
+
+
+class TokenScanner:
+    """
+    Extrae claims de JWT embebidos en archivos grandes (logs) sin verificar firmas.
+    Los archivos se leen vía mmap y se dividen en chunks repartidos entre procesos.
+    """
+
+    def __init__(
+        self,
+        claims: Sequence[str] = ("sub", "exp", "aud"),
+        workers: Optional[int] = None,
+        bucket_seconds: int = 3600,
+        chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+        now: Optional[int] = None,
+    ) -> None:
+        self._claims = tuple(claims)
+        self._workers = workers or os.cpu_count() or 1
+        self._bucket_seconds = bucket_seconds
+        self._chunk_bytes = max(chunk_bytes, MAX_TOKEN_BYTES)
+        self._now = now
+        self.stats = ScanStats()
+
+    def scan(self, paths: Sequence[str], collect_records: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Genera los claims seleccionados de cada token, en el orden del archivo.
+        Las estadísticas agregadas quedan en self.stats al terminar la iteración.
+        """
+        now = self._now if self._now is not None else int(time.time())
+        tasks = [
+            _ChunkTask(
+                path=path,
+                start=start,
+                end=min(start + self._chunk_bytes, size),
+                claims=self._claims,
+                now=now,
+                bucket_seconds=self._bucket_seconds,
+                collect_records=collect_records,
+            )
+            for path, size in ((p, os.path.getsize(p)) for p in paths)
+            for start in range(0, size, self._chunk_bytes)
+        ]
+
+        workers = min(self._workers, len(tasks))
+        if workers <= 1:
+            results = map(_scan_chunk, tasks)
+            yield from self._collect(results)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            yield from self._collect(pool.map(_scan_chunk, tasks))
+
+    def _collect(self, results: Iterator[Tuple[List[Dict[str, Any]], ScanStats]]) -> Iterator[Dict[str, Any]]:
+        for records, stats in results:
+            self.stats.merge(stats)
+            yield from records
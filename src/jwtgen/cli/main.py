@@ -1,16 +1,22 @@
+import sys
 import typer
 import json
+import time
 from typing import List, Optional
 from importlib.metadata import version as pkg_version, PackageNotFoundError
 
-from jwtgen.domain.claims import parse_claims_list, ClaimError
+from jwtgen.domain.claims import parse_claims_list, parse_ttl_to_seconds, ClaimError
 from jwtgen.domain.identifiers import (
-    generate_uuid_v4_batch,
+    JTI_KINDS,
+    generate_uuid_batch,
     format_uuid,
     IdentifierError,
 )
 from jwtgen.application.dto import SignJwtRequest
 from jwtgen.application.jwt_service import JwtService, JwtServiceError
+from jwtgen.application.config_validation import ConfigValidationService
+from jwtgen.application.stdio_server import StdioSignServer
+from jwtgen.application.token_scanner import TokenScanner
 from jwtgen.config.loader import ConfigLoader, ConfigError
 
 app = typer.Typer(
@@ -38,7 +44,13 @@ def uuid_v4(
         "--count",
         "-n",
         min=1,
-        help="Cantidad de UUID v4 a generar.",
+        help="Cantidad de UUID a generar.",
+    ),
+    uuid_version: int = typer.Option(
+        4,
+        "--version",
+        "-v",
+        help="Versión de UUID: 4 (aleatorio) o 7 (ordenable por tiempo).",
     ),
     upper: bool = typer.Option(
         False,
@@ -52,10 +64,10 @@ def uuid_v4(
     ),
 ) -> None:
     """
-    Genera uno o más UUID versión 4.
+    Genera uno o más UUID versión 4 (por defecto) o 7.
     """
     try:
-        generated_values = generate_uuid_v4_batch(count)
+        generated_values = generate_uuid_batch(count, version=uuid_version)
     except IdentifierError as e:
         raise typer.BadParameter(str(e))
 
@@ -125,7 +137,78 @@ def show_profile(
         raise typer.BadParameter(str(e))
 
     typer.echo(json.dumps(info, indent=2, ensure_ascii=False))
-    
+
+
+@app.command("validate-config")
+def validate_config(
+    config: str = typer.Option(
+        "configs/envs.example.yaml",
+        "--config",
+        "-c",
+        help="Ruta al YAML con envs/profiles/keys",
+    ),
+    workers: int = typer.Option(
+        None,
+        "--workers",
+        "-w",
+        min=1,
+        help="Procesos en paralelo (por defecto: núcleos disponibles).",
+    ),
+    as_json: bool = typer.Option(
+        False,
+        "--json",
+        help="Imprime el resultado como JSON.",
+    ),
+) -> None:
+    """
+    Valida las llaves de todos los profiles (PEM, certificado vs llave privada, alg vs tipo de llave).
+    Retorna código de salida 1 si algún profile falla.
+    """
+    started = time.perf_counter()
+    try:
+        results = ConfigValidationService(workers=workers).validate(config)
+    except ConfigError as e:
+        raise typer.BadParameter(str(e))
+    total_ms = (time.perf_counter() - started) * 1000.0
+
+    failed = [r for r in results if not r.ok]
+
+    if as_json:
+        typer.echo(
+            json.dumps(
+                {
+                    "config": config,
+                    "total": len(results),
+                    "failed": len(failed),
+                    "elapsed_ms": round(total_ms, 3),
+                    "profiles": [
+                        {
+                            "env": r.env,
+                            "profile": r.profile,
+                            "ok": r.ok,
+                            "elapsed_ms": round(r.elapsed_ms, 3),
+                            "error": r.error,
+                        }
+                        for r in results
+                    ],
+                },
+                indent=2,
+                ensure_ascii=False,
+            )
+        )
+    else:
+        for r in results:
+            status = "OK  " if r.ok else "FAIL"
+            line = f"{status} {r.env}/{r.profile} ({r.elapsed_ms:.1f} ms)"
+            if r.error:
+                line += f": {r.error}"
+            typer.echo(line)
+        typer.echo(f"{len(results) - len(failed)}/{len(results)} profiles válidos en {total_ms:.1f} ms")
+
+    if failed:
+        raise typer.Exit(code=1)
+
+
 @app.command()
 def sign(
     config: str = typer.Option(
@@ -134,9 +217,9 @@ def sign(
         "-c",
         help="Ruta al YAML con envs/profiles/keys",
     ),
-    env: str = typer.Option(..., "--env", "-e", help="Ambiente (qa/dev/pdn, etc.)"),
-    profile: str = typer.Option(..., "--profile", "-p", help="Perfil / app dentro del ambiente"),
-    sub: str = typer.Option(..., "--sub", help="Subject (sub)"),
+    env: str = typer.Option(None, "--env", "-e", help="Ambiente (qa/dev/pdn, etc.). Requerido salvo con --stdio."),
+    profile: str = typer.Option(None, "--profile", "-p", help="Perfil / app dentro del ambiente. Requerido salvo con --stdio."),
+    sub: str = typer.Option(None, "--sub", help="Subject (sub). Requerido salvo con --stdio."),
     aud: str = typer.Option(None, "--aud", help="Audience override"),
     iss: str = typer.Option(None, "--iss", help="Issuer override"),
     ttl: str = typer.Option(None, "--ttl", help="TTL relativo (ej: 1h, 30m, 7d)"),
@@ -166,17 +249,73 @@ def sign(
         "--payload",
         help="Nombre del template payload (configs/payloads/<name>.json). Override sobre el profile.",
     ),
+    compact: bool = typer.Option(
+        False,
+        "--compact",
+        help="Modo tamaño reducido: JSON mínimo, claims ordenados y aliases del template (<name>.aliases.json).",
+    ),
+    compress: bool = typer.Option(
+        False,
+        "--compress",
+        help="Comprime el payload con DEFLATE (header zip=DEF). Implica --compact; el verificador debe soportarlo.",
+    ),
+    jti: str = typer.Option(
+        None,
+        "--jti",
+        help=f"Genera el claim jti automáticamente: {'|'.join(JTI_KINDS)}.",
+    ),
+    report_size: bool = typer.Option(
+        False,
+        "--report-size",
+        help="Imprime en stderr el tamaño del token y los bytes ahorrados vs el modo por defecto.",
+    ),
+    stdio: bool = typer.Option(
+        False,
+        "--stdio",
+        help="Modo co-proceso: lee un SignJwtRequest JSON por línea en stdin y escribe un resultado JSON por línea.",
+    ),
+    workers: int = typer.Option(
+        1,
+        "--workers",
+        "-w",
+        min=1,
+        help="Con --stdio: solicitudes firmadas en paralelo (las respuestas pueden salir en otro orden).",
+    ),
 ) -> None:
     """
     Firma un JWT RS256 usando config YAML (env/profile), con claims extra opcionales.
     Salida por defecto: solo JWT.
     Con --print-payload: payload primero y luego JWT.
+    Con --stdio: las opciones dadas actúan como valores por defecto de cada solicitud.
     """
     try:
         extra_claims = parse_claims_list(claim)
     except ClaimError as e:
         raise typer.BadParameter(str(e))
 
+    if stdio:
+        defaults = SignJwtRequest(
+            config_path=config,
+            env=env or "",
+            profile=profile or "",
+            sub=sub or "",
+            aud=aud,
+            iss=iss,
+            ttl=ttl,
+            exp=exp,
+            extra_claims=extra_claims,
+            payload_template=payload,
+            compact=compact or compress,
+            compress=compress,
+            jti=jti,
+        )
+        StdioSignServer(defaults=defaults, workers=workers).serve(sys.stdin, sys.stdout)
+        return
+
+    for name, value in (("--env", env), ("--profile", profile), ("--sub", sub)):
+        if not value:
+            raise typer.BadParameter(f"{name} es requerido.")
+
     service = JwtService()
 
     try:
@@ -192,11 +331,26 @@ def sign(
                 exp=exp,
                 extra_claims=extra_claims,
                 payload_template=payload,
+                compact=compact or compress,
+                compress=compress,
+                jti=jti,
             )
         )
     except JwtServiceError as e:
         raise typer.BadParameter(str(e))
 
+    if report_size:
+        report = result.size_report
+        if report is None:
+            typer.echo(f"size={len(result.token)} bytes", err=True)
+        else:
+            pct = (report.saved_bytes / report.baseline_bytes * 100.0) if report.baseline_bytes else 0.0
+            typer.echo(
+                f"size={report.final_bytes} bytes baseline={report.baseline_bytes} bytes "
+                f"saved={report.saved_bytes} bytes ({pct:.1f}%)",
+                err=True,
+            )
+
     if verbose:
         typer.echo(f"config={config}")
         typer.echo(f"env={env} profile={profile}")
@@ -212,5 +366,58 @@ def sign(
     typer.echo(result.token)
 
 
+@app.command()
+def decode(
+    files: List[str] = typer.Argument(..., help="Archivos (ej: logs) donde buscar JWT."),
+    claims: str = typer.Option(
+        "sub,exp,aud",
+        "--claims",
+        help="Claims a emitir por token, separados por coma.",
+    ),
+    stats: bool = typer.Option(
+        False,
+        "--stats",
+        help="Imprime en stderr estadísticas agregadas (expirados, histograma de exp, conteo por aud).",
+    ),
+    no_records: bool = typer.Option(
+        False,
+        "--no-records",
+        help="No emite un registro por token (útil junto con --stats).",
+    ),
+    bucket: str = typer.Option(
+        "1h",
+        "--bucket",
+        help="Tamaño de bucket del histograma de exp (ej: 15m, 1h, 1d).",
+    ),
+    workers: int = typer.Option(
+        None,
+        "--workers",
+        "-w",
+        min=1,
+        help="Procesos en paralelo (por defecto: núcleos disponibles).",
+    ),
+) -> None:
+    """
+    Extrae claims de JWT embebidos en archivos, SIN verificar firmas.
+    Salida: un JSON por línea (NDJSON) con los claims seleccionados.
+    """
+    try:
+        bucket_seconds = parse_ttl_to_seconds(bucket)
+    except ClaimError as e:
+        raise typer.BadParameter(str(e))
+
+    selected = tuple(c.strip() for c in claims.split(",") if c.strip())
+    scanner = TokenScanner(claims=selected, workers=workers, bucket_seconds=bucket_seconds)
+
+    try:
+        for record in scanner.scan(files, collect_records=not no_records):
+            typer.echo(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+    except OSError as e:
+        raise typer.BadParameter(f"No se pudo leer archivo: {e}")
+
+    if stats:
+        typer.echo(json.dumps(scanner.stats.to_dict(bucket_seconds), indent=2, ensure_ascii=False), err=True)
+
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Callable, Dict, Generic, Tuple, TypeVar
+
+T = TypeVar("T")
+
+_StatSignature = Tuple[int, int, int]
+
+
+def stat_signature(path: Path) -> _StatSignature:
+    """
+    Firma barata de un archivo (mtime_ns, size, inode) para invalidar caches.
+    """
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class FileStatCache(Generic[T]):
+    """
+    Cache de valores derivados de archivos, invalidado por stat (mtime/size/inode).
+    Si el archivo cambia en disco, el siguiente get() vuelve a cargarlo.
+    Sin lock: las operaciones sobre dict son atómicas; en concurrencia un archivo
+    puede cargarse dos veces y los contadores son aproximados.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, Tuple[_StatSignature, T]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: Path, loader: Callable[[Path], T]) -> T:
+        key = str(path)
+        signature = stat_signature(path)
+
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == signature:
+            self.hits += 1
+            return entry[1]
+
+        value = loader(path)
+        self.misses += 1
+        self._entries[key] = (signature, value)
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Any, Optional, Dict
-from jwtgen.config.models import AppConfig
+from pydantic import ValidationError
+from jwtgen.config.models import AppConfig, EnvironmentConfig, KeyConfig, ProfileConfig
+from jwtgen.crypto.key_sources import KeyReference, KEY_SOURCE_ENV, KEY_SOURCE_FILE, KEY_SOURCE_INLINE
 
 
 class ConfigError(Exception):
@@ -17,11 +20,23 @@ class ResolvedProfile:
     audience_default: str
     alg: str
     default_ttl: str
-    public_cer: str
-    private_pem: str
+    public_cer: KeyReference
+    private_pem: KeyReference
     payload_template: str
 
 
+@dataclass(frozen=True)
+class RawProfile:
+    """
+    Profile tal como viene del YAML, antes de validar su schema.
+    """
+
+    env_name: str
+    profile_name: str
+    issuer_default: Any
+    data: Any
+
+
 class ConfigLoader:
     def __init__(self, path: str) -> None:
         self._path = path
@@ -52,18 +67,99 @@ class ConfigLoader:
             available = ", ".join(sorted(env_cfg.profiles.keys()))
             raise ConfigError(f"Profile '{profile}' no existe en '{env}'. Disponibles: {available}")
 
+        return self._build_resolved(env, profile, env_cfg.issuer_default, prof_cfg)
+
+    def list_raw_profiles(self) -> list[RawProfile]:
+        """
+        Recorre environments/profiles del YAML sin validar el schema de cada
+        profile (orden env/profile). Solo falla si el YAML o esa estructura
+        están rotos, para que un profile inválido no oculte a los demás.
+        """
+        data = self._read_yaml(self._path)
+        if not isinstance(data, dict) or not isinstance(data.get("environments"), dict):
+            raise ConfigError("Error validando configuración: se esperaba un mapa 'environments'")
+
+        raw: list[RawProfile] = []
+        for env_name, env_data in data["environments"].items():
+            if not isinstance(env_data, dict) or not isinstance(env_data.get("profiles"), dict):
+                raise ConfigError(f"Error validando configuración: se esperaba un mapa 'profiles' en '{env_name}'")
+            for profile_name, profile_data in env_data["profiles"].items():
+                raw.append(RawProfile(
+                    env_name=str(env_name),
+                    profile_name=str(profile_name),
+                    issuer_default=env_data.get("issuer_default"),
+                    data=profile_data,
+                ))
+
+        return sorted(raw, key=lambda r: (r.env_name, r.profile_name))
+
+    def resolve_raw(self, raw: RawProfile) -> ResolvedProfile:
+        """
+        Valida el schema de un único profile y lo resuelve.
+        """
+        errors: list[str] = []
+        try:
+            env_cfg = EnvironmentConfig(issuer_default=raw.issuer_default, profiles={})
+        except ValidationError as e:
+            errors.extend(self._describe_errors(e))
+        try:
+            prof_cfg = ProfileConfig.model_validate(raw.data)
+        except ValidationError as e:
+            errors.extend(self._describe_errors(e))
+        if errors:
+            raise ConfigError(f"Error validando configuración: {'; '.join(errors)}")
+
+        return self._build_resolved(raw.env_name, raw.profile_name, env_cfg.issuer_default, prof_cfg)
+
+    @staticmethod
+    def _describe_errors(error: ValidationError) -> list[str]:
+        return [
+            f"{'.'.join(str(part) for part in err['loc']) or 'profile'}: {err['msg']}"
+            for err in error.errors()
+        ]
+
+    def _build_resolved(self, env: str, profile: str, issuer_default: str, prof_cfg: ProfileConfig) -> ResolvedProfile:
         return ResolvedProfile(
             env_name=env,
             profile_name=profile,
-            issuer_default=env_cfg.issuer_default,
+            issuer_default=issuer_default,
             audience_default=prof_cfg.audience_default,
             alg=prof_cfg.alg,
             default_ttl=prof_cfg.defaults.ttl or "1h",
             payload_template=prof_cfg.payload_template or "generic",
-            public_cer=prof_cfg.keys.public_cer,
-            private_pem=prof_cfg.keys.private_pem,
+            public_cer=self._key_reference(prof_cfg.keys, "public_cer"),
+            private_pem=self._key_reference(prof_cfg.keys, "private_pem"),
         )
 
+    def _key_reference(self, keys: KeyConfig, name: str) -> KeyReference:
+        """
+        Construye la referencia sin leer el material: archivos y variables de
+        ambiente se leen recién al firmar. Rutas relativas son relativas al YAML.
+        """
+        file_value = getattr(keys, f"{name}_file")
+        if file_value is not None:
+            path = Path(file_value).expanduser()
+            if not path.is_absolute():
+                path = Path(self._path).resolve().parent / path
+            return KeyReference(kind=KEY_SOURCE_FILE, value=str(path))
+
+        env_value = getattr(keys, f"{name}_env")
+        if env_value is not None:
+            return KeyReference(kind=KEY_SOURCE_ENV, value=env_value)
+
+        return KeyReference(kind=KEY_SOURCE_INLINE, value=getattr(keys, name))
+
+    def resolve_all(self) -> list[ResolvedProfile]:
+        """
+        Resuelve todos los profiles de todos los ambientes (orden env/profile).
+        """
+        cfg = self.load()
+        return [
+            self.resolve(env=env_name, profile=profile_name)
+            for env_name in sorted(cfg.environments.keys())
+            for profile_name in sorted(cfg.environments[env_name].profiles.keys())
+        ]
+
     def list_envs(self) -> list[str]:
         cfg = self.load()
         return sorted(cfg.environments.keys())
@@ -76,7 +172,7 @@ class ConfigLoader:
             raise ConfigError(f"Ambiente '{env}' no existe. Disponibles: {available}")
         return sorted(env_cfg.profiles.keys())
 
-    def show_profile_safe(self, env: str, profile: str) -> dict[str, str]:
+    def show_profile_safe(self, env: str, profile: str) -> dict[str, Any]:
         resolved = self.resolve(env=env, profile=profile)
 
         return {
@@ -87,12 +183,15 @@ class ConfigLoader:
             "audience_default": resolved.audience_default,
             "default_ttl": resolved.default_ttl,
             "payload_template": resolved.payload_template,
+            "keys": {
+                "public_cer": resolved.public_cer.describe(),
+                "private_pem": resolved.private_pem.describe(),
+            },
         }
 
     @staticmethod
     def _read_yaml(path: str) -> Dict[str, Any]:
         import yaml
-        from pathlib import Path
 
         p = Path(path)
         if not p.exists():
@@ -1,12 +1,35 @@
 from __future__ import annotations
 
 from typing import Dict, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class KeyConfig(BaseModel):
-    public_cer: str = Field(..., min_length=20, description="Certificado público X509 (PEM con BEGIN/END) en una sola línea")
-    private_pem: str = Field(..., min_length=20, description="Llave privada PEM (BEGIN/END) en una sola línea")
+    """
+    Cada llave se define con exactamente una fuente: inline, archivo (PEM o DER)
+    o variable de ambiente. Los archivos y variables se leen recién al firmar.
+    """
+
+    public_cer: Optional[str] = Field(default=None, min_length=20, description="Certificado público X509 (PEM con BEGIN/END) en una sola línea")
+    public_cer_file: Optional[str] = Field(default=None, min_length=1, description="Ruta a certificado PEM o DER (relativa al YAML)")
+    public_cer_env: Optional[str] = Field(default=None, min_length=1, description="Variable de ambiente con el certificado (PEM o DER base64)")
+    private_pem: Optional[str] = Field(default=None, min_length=20, description="Llave privada PEM (BEGIN/END) en una sola línea")
+    private_pem_file: Optional[str] = Field(default=None, min_length=1, description="Ruta a llave privada PEM o DER (relativa al YAML)")
+    private_pem_env: Optional[str] = Field(default=None, min_length=1, description="Variable de ambiente con la llave privada (PEM o DER base64)")
+
+    @model_validator(mode="after")
+    def _exactly_one_source_per_key(self) -> "KeyConfig":
+        for name in ("public_cer", "private_pem"):
+            sources = [
+                field
+                for field in (name, f"{name}_file", f"{name}_env")
+                if getattr(self, field) is not None
+            ]
+            if len(sources) != 1:
+                raise ValueError(
+                    f"keys debe definir exactamente uno de {name}, {name}_file, {name}_env (definidos: {sources or 'ninguno'})"
+                )
+        return self
 
 
 class ProfileDefaults(BaseModel):
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import re
+import base64
+import binascii
 from cryptography import x509
 from dataclasses import dataclass
-from cryptography.hazmat.primitives.serialization import load_pem_private_key
+from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat, load_der_private_key, load_pem_private_key
+from cryptography.hazmat.primitives.asymmetric import ec, ed448, ed25519, rsa
 from cryptography.hazmat.primitives.asymmetric.types import PrivateKeyTypes, PublicKeyTypes
 
 
@@ -60,6 +63,51 @@ class KeyMaterial:
     private_key: PrivateKeyTypes
 
 
+def _is_pem(data: bytes) -> bool:
+    # Puede traer texto previo (ej: "Bag Attributes" de un export pkcs12).
+    return b"-----BEGIN" in data
+
+
+def _decode_der(data: bytes) -> bytes:
+    """
+    Acepta DER binario o DER en base64 (caso típico de variables de ambiente),
+    incluido base64 partido en líneas como lo emite `base64` de GNU.
+    """
+    compact = b"".join(data.split())
+    try:
+        return base64.b64decode(compact, validate=True)
+    except (binascii.Error, ValueError):
+        return data
+
+
+def load_key_material(public_cer: bytes, private_key: bytes) -> KeyMaterial:
+    """
+    Carga:
+    - public_cer: certificado X.509 en PEM (una sola línea permitida) o DER
+    - private_key: llave privada en PEM (una sola línea permitida) o DER (PKCS#8/PKCS#1)
+    """
+    try:
+        if _is_pem(public_cer):
+            cert = x509.load_pem_x509_certificate(normalize_pem_one_line(public_cer.decode("utf-8")))
+        else:
+            cert = x509.load_der_x509_certificate(_decode_der(public_cer))
+        public_key = cert.public_key()
+    except Exception as e:
+        raise KeyMaterialError(f"Error cargando certificado público (CER/PEM/DER): {e}") from e
+
+    try:
+        if _is_pem(private_key):
+            loaded_private_key = load_pem_private_key(
+                normalize_pem_one_line(private_key.decode("utf-8")), password=None
+            )
+        else:
+            loaded_private_key = load_der_private_key(_decode_der(private_key), password=None)
+    except Exception as e:
+        raise KeyMaterialError(f"Error cargando llave privada (PEM/DER): {e}") from e
+
+    return KeyMaterial(public_key=public_key, private_key=loaded_private_key)
+
+
 def load_key_material_from_inline(public_cer_inline: str, private_pem_inline: str) -> KeyMaterial:
     """
     Carga:
@@ -79,4 +127,49 @@ def load_key_material_from_inline(public_cer_inline: str, private_pem_inline: st
     except Exception as e:
         raise KeyMaterialError(f"Error cargando llave privada (PEM): {e}") from e
 
-    return KeyMaterial(public_key=public_key, private_key=private_key)
\ No newline at end of file
+    return KeyMaterial(public_key=public_key, private_key=private_key)
+
+# El pipeline de firma (Rs256JwtSigner) solo emite RS256.
+SUPPORTED_SIGNING_ALGS = {"RS256": "RSA"}
+
+
+def _key_family(private_key: PrivateKeyTypes) -> str:
+    if isinstance(private_key, rsa.RSAPrivateKey):
+        return "RSA"
+    if isinstance(private_key, ec.EllipticCurvePrivateKey):
+        return "EC"
+    if isinstance(private_key, (ed25519.Ed25519PrivateKey, ed448.Ed448PrivateKey)):
+        return "OKP"
+    return type(private_key).__name__
+
+
+def verify_key_pair(keys: KeyMaterial) -> None:
+    """
+    Verifica que la llave pública del certificado corresponda a la llave privada.
+    """
+    try:
+        cert_spki = keys.public_key.public_bytes(Encoding.DER, PublicFormat.SubjectPublicKeyInfo)
+        derived_spki = keys.private_key.public_key().public_bytes(
+            Encoding.DER, PublicFormat.SubjectPublicKeyInfo
+        )
+    except Exception as e:
+        raise KeyMaterialError(f"No se pudo comparar certificado y llave privada: {e}") from e
+
+    if cert_spki != derived_spki:
+        raise KeyMaterialError("La llave pública del certificado no corresponde a la llave privada.")
+
+
+def check_alg_matches_key(alg: str, private_key: PrivateKeyTypes) -> None:
+    """
+    Valida que el algoritmo configurado (alg) sea uno que jwtgen puede firmar
+    y que sea compatible con el tipo de llave.
+    """
+    alg = (alg or "").strip().upper()
+    expected = SUPPORTED_SIGNING_ALGS.get(alg)
+    if expected is None:
+        supported = ", ".join(sorted(SUPPORTED_SIGNING_ALGS))
+        raise KeyMaterialError(f"alg '{alg}' no soportado por jwtgen. Soportados: {supported}.")
+
+    family = _key_family(private_key)
+    if family != expected:
+        raise KeyMaterialError(f"alg '{alg}' requiere llave {expected}, pero la llave es {family}.")
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+from jwtgen.common.file_cache import FileStatCache
+from jwtgen.crypto.key_material import KeyMaterial, KeyMaterialError, load_key_material
+
+
+KEY_SOURCE_INLINE = "inline"
+KEY_SOURCE_FILE = "file"
+KEY_SOURCE_ENV = "env"
+
+_KEY_SOURCE_KINDS = {KEY_SOURCE_INLINE, KEY_SOURCE_FILE, KEY_SOURCE_ENV}
+
+# Bytes crudos de archivos de llaves, invalidados por stat.
+_key_file_cache: FileStatCache[bytes] = FileStatCache()
+
+
+@dataclass(frozen=True)
+class KeyReference:
+    """
+    Referencia a material de llave:
+    - inline: value es el PEM (una sola línea permitida)
+    - file: value es la ruta absoluta a un archivo PEM o DER
+    - env: value es el nombre de la variable de ambiente (PEM o DER en base64)
+    """
+
+    kind: str
+    value: str
+
+    def __post_init__(self) -> None:
+        if self.kind not in _KEY_SOURCE_KINDS:
+            raise KeyMaterialError(f"Tipo de referencia de llave inválido: '{self.kind}'")
+
+    def describe(self) -> str:
+        """
+        Descripción segura (sin exponer material de llave).
+        """
+        if self.kind == KEY_SOURCE_INLINE:
+            return KEY_SOURCE_INLINE
+        return f"{self.kind}:{self.value}"
+
+
+def _read_file_bytes(path: Path) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def read_key_reference(ref: KeyReference) -> bytes:
+    """
+    Lee el contenido de la referencia. Los archivos se leen completos en una sola
+    lectura y se cachean por stat, así que firmar repetidamente no vuelve a tocar disco.
+    """
+    if ref.kind == KEY_SOURCE_INLINE:
+        return ref.value.encode("utf-8")
+
+    if ref.kind == KEY_SOURCE_ENV:
+        value = os.environ.get(ref.value)
+        if not value:
+            raise KeyMaterialError(f"Variable de ambiente '{ref.value}' no definida o vacía.")
+        return value.encode("utf-8")
+
+    path = Path(ref.value)
+    try:
+        return _key_file_cache.get(path, _read_file_bytes)
+    except OSError as e:
+        raise KeyMaterialError(f"No se pudo leer archivo de llave '{path}': {e}") from e
+
+
+def load_key_material_from_references(public_cer: KeyReference, private_pem: KeyReference) -> KeyMaterial:
+    """
+    Lee ambas referencias y carga el material de llave (PEM o DER).
+    """
+    return load_key_material(
+        public_cer=read_key_reference(public_cer),
+        private_key=read_key_reference(private_pem),
+    )
@@ -1,34 +1,118 @@
 from __future__ import annotations
 
 import jwt
+import json
+import base64
+import zlib
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Dict, Optional
+from jwt.algorithms import RSAAlgorithm
 from jwtgen.crypto.key_material import KeyMaterial
 
 
+_RS256 = RSAAlgorithm(RSAAlgorithm.SHA256)
+
+
 class JwtSignError(Exception):
     pass
 
 
+@dataclass(frozen=True)
+class CompactOptions:
+    """
+    Modo de tamaño reducido:
+    - serialización JSON mínima (sin espacios, sin escapar no-ASCII) y claims ordenados
+    - aliases: renombra claims no estándar (ej: {"channel": "ch"})
+    - compress: comprime el payload con DEFLATE crudo y agrega `zip: DEF` al header
+      (solo si efectivamente reduce el tamaño; requiere un verificador que lo soporte)
+    """
+
+    aliases: Dict[str, str] = field(default_factory=dict)
+    compress: bool = False
+
+
+@dataclass(frozen=True)
+class TokenSizeReport:
+    baseline_bytes: int
+    final_bytes: int
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.baseline_bytes - self.final_bytes
+
+
 @dataclass(frozen=True)
 class SignResult:
     token: str
     header: Dict[str, Any]
     payload: Dict[str, Any]
+    size_report: Optional[TokenSizeReport] = None
+
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64url_len(data: bytes) -> int:
+    return len(_b64url(data))
+
+
+def _default_json(obj: Dict[str, Any], sort_keys: bool = False) -> bytes:
+    # Misma serialización que usa PyJWT por defecto.
+    return json.dumps(obj, separators=(",", ":"), sort_keys=sort_keys).encode("utf-8")
+
+
+def _compact_json(obj: Dict[str, Any]) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), sort_keys=True, ensure_ascii=False).encode("utf-8")
+
+
+def _deflate_raw(data: bytes) -> bytes:
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def apply_claim_aliases(payload: Dict[str, Any], aliases: Dict[str, str]) -> Dict[str, Any]:
+    if not aliases:
+        return payload
+
+    aliased: Dict[str, Any] = {}
+    for k, v in payload.items():
+        name = aliases.get(k, k)
+        if name in aliased:
+            raise JwtSignError(f"Alias '{name}' colisiona con otro claim del payload.")
+        aliased[name] = v
+    return aliased
 
 
 class Rs256JwtSigner:
-    def sign(self, payload: Dict[str, Any], keys: KeyMaterial, kid: Optional[str] = None) -> SignResult:
-        if not isinstance(payload, dict) or not payload:
-            raise JwtSignError("Payload vacío o inválido.")
+    def __init__(self) -> None:
+        self._header_segments: Dict[Optional[str], bytes] = {}
 
+    @staticmethod
+    def _headers(kid: Optional[str]) -> Dict[str, Any]:
         headers: Dict[str, Any] = {
             "typ": "JWT",
             "alg": "RS256",
         }
         if kid:
             headers["kid"] = kid
+        return headers
+
+    def sign(
+        self,
+        payload: Dict[str, Any],
+        keys: KeyMaterial,
+        kid: Optional[str] = None,
+        compact: Optional[CompactOptions] = None,
+    ) -> SignResult:
+        if not isinstance(payload, dict) or not payload:
+            raise JwtSignError("Payload vacío o inválido.")
+
+        headers = self._headers(kid)
+
+        if compact is not None:
+            return self._sign_compact(payload=payload, keys=keys, headers=headers, options=compact)
 
         try:
             token = jwt.encode(
@@ -40,4 +124,72 @@ class Rs256JwtSigner:
         except Exception as e:
             raise JwtSignError(f"Error firmando JWT RS256: {e}") from e
 
-        return SignResult(token=token, header=headers, payload=payload)
\ No newline at end of file
+        return SignResult(token=token, header=headers, payload=payload)
+
+    def _sign_compact(
+        self,
+        payload: Dict[str, Any],
+        keys: KeyMaterial,
+        headers: Dict[str, Any],
+        options: CompactOptions,
+    ) -> SignResult:
+        baseline_header_len = _b64url_len(_default_json(headers, sort_keys=True))
+        baseline_payload_len = _b64url_len(_default_json(payload))
+
+        final_payload = apply_claim_aliases(payload, options.aliases)
+        try:
+            payload_bytes = _compact_json(final_payload)
+        except (TypeError, ValueError) as e:
+            raise JwtSignError(f"Payload no serializable a JSON: {e}") from e
+
+        if options.compress:
+            deflated = _deflate_raw(payload_bytes)
+            if len(deflated) < len(payload_bytes):
+                payload_bytes = deflated
+                headers = {**headers, "zip": "DEF"}
+
+        try:
+            token = jwt.api_jws.encode(
+                payload_bytes,
+                keys.private_key,
+                algorithm="RS256",
+                headers=headers,
+            )
+        except Exception as e:
+            raise JwtSignError(f"Error firmando JWT RS256: {e}") from e
+
+        signature_len = len(token) - token.rindex(".") - 1
+        report = TokenSizeReport(
+            baseline_bytes=baseline_header_len + baseline_payload_len + signature_len + 2,
+            final_bytes=len(token),
+        )
+        return SignResult(token=token, header=headers, payload=final_payload, size_report=report)
+
+    def sign_encoded(
+        self,
+        payload_segment: bytes,
+        payload: Dict[str, Any],
+        keys: KeyMaterial,
+        kid: Optional[str] = None,
+    ) -> SignResult:
+        """
+        Firma un payload ya serializado y codificado en base64url (ver PayloadSkeleton).
+        El header se serializa igual que PyJWT y se reutiliza entre tokens.
+        """
+        if not payload_segment:
+            raise JwtSignError("Payload vacío o inválido.")
+
+        headers = self._headers(kid)
+        header_segment = self._header_segments.get(kid)
+        if header_segment is None:
+            header_segment = _b64url(_default_json(headers, sort_keys=True))
+            self._header_segments[kid] = header_segment
+
+        signing_input = header_segment + b"." + payload_segment
+        try:
+            signature = _RS256.sign(signing_input, keys.private_key)
+        except Exception as e:
+            raise JwtSignError(f"Error firmando JWT RS256: {e}") from e
+
+        token = (signing_input + b"." + _b64url(signature)).decode("ascii")
+        return SignResult(token=token, header=headers, payload=payload)
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+import os
+import time
 import uuid
+import base64
+import threading
 from typing import List
 
 
@@ -8,11 +12,52 @@ class IdentifierError(Exception):
     """Error de validación/generación de identificadores."""
 
 
+JTI_KINDS = ("uuid4", "uuid7", "random128")
+UUID_VERSIONS = (4, 7)
+
+_POOL_BLOCK_BYTES = 64 * 1024
+
+
+class _RandomPool:
+    """
+    Bytes aleatorios (os.urandom) pre-leídos en bloques grandes para evitar una
+    llamada al sistema por identificador. Seguro entre hilos; tras un fork el hijo
+    descarta el bloque heredado para no repetir valores del padre.
+    """
+
+    def __init__(self, block_size: int = _POOL_BLOCK_BYTES) -> None:
+        self._block_size = block_size
+        self._lock = threading.Lock()
+        self._buffer = b""
+        self._offset = 0
+
+    def take(self, n: int) -> bytes:
+        with self._lock:
+            if self._offset + n > len(self._buffer):
+                self._buffer = os.urandom(max(self._block_size, n))
+                self._offset = 0
+            start = self._offset
+            self._offset += n
+            return self._buffer[start : self._offset]
+
+    def reset(self) -> None:
+        self._lock = threading.Lock()
+        self._buffer = b""
+        self._offset = 0
+
+
+_pool = _RandomPool()
+
+
+def _uuid_v4_from_bytes(raw: bytes) -> str:
+    return str(uuid.UUID(bytes=raw, version=4))
+
+
 def generate_uuid_v4() -> str:
     """
     Genera un UUID versión 4 en formato canónico RFC 4122.
     """
-    return str(uuid.uuid4())
+    return _uuid_v4_from_bytes(_pool.take(16))
 
 
 def generate_uuid_v4_batch(count: int) -> List[str]:
@@ -22,7 +67,99 @@ def generate_uuid_v4_batch(count: int) -> List[str]:
     if count < 1:
         raise IdentifierError("count debe ser mayor o igual a 1")
 
-    return [generate_uuid_v4() for _ in range(count)]
+    raw = _pool.take(16 * count)
+    return [_uuid_v4_from_bytes(raw[i : i + 16]) for i in range(0, len(raw), 16)]
+
+
+class UuidV7Generator:
+    """
+    UUID v7 (RFC 9562) monótono: timestamp unix en ms + contador de 12 bits (rand_a)
+    + 62 bits aleatorios. Dentro del mismo ms (o si el reloj retrocede) incrementa
+    el contador; si se desborda avanza el timestamp. Seguro entre hilos.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._last_ms = 0
+        self._counter = 0
+
+    def generate(self) -> str:
+        return self.generate_batch(1)[0]
+
+    def generate_batch(self, count: int) -> List[str]:
+        if count < 1:
+            raise IdentifierError("count debe ser mayor o igual a 1")
+
+        raw = _pool.take(10 * count)
+        values: List[str] = []
+        with self._lock:
+            for i in range(count):
+                rand = raw[i * 10 : i * 10 + 10]
+                ms = time.time_ns() // 1_000_000
+                if ms > self._last_ms:
+                    self._last_ms = ms
+                    # Semilla aleatoria con el bit alto en 0: deja margen para incrementar.
+                    self._counter = int.from_bytes(rand[:2], "big") & 0x7FF
+                else:
+                    self._counter += 1
+                    if self._counter > 0xFFF:
+                        self._last_ms += 1
+                        self._counter = 0
+
+                rand_b = int.from_bytes(rand[2:], "big") & ((1 << 62) - 1)
+                value = (
+                    (self._last_ms & ((1 << 48) - 1)) << 80
+                    | 0x7 << 76
+                    | self._counter << 64
+                    | 0b10 << 62
+                    | rand_b
+                )
+                values.append(str(uuid.UUID(int=value)))
+        return values
+
+    def reset(self) -> None:
+        self._lock = threading.Lock()
+
+
+_uuid_v7 = UuidV7Generator()
+
+
+def generate_uuid_v7() -> str:
+    """
+    Genera un UUID versión 7 (ordenable por tiempo, monótono en el proceso).
+    """
+    return _uuid_v7.generate()
+
+
+def generate_uuid_batch(count: int, version: int = 4) -> List[str]:
+    """
+    Genera `count` UUID de la versión indicada (4 o 7).
+    """
+    if version == 4:
+        return generate_uuid_v4_batch(count)
+    if version == 7:
+        return _uuid_v7.generate_batch(count)
+    raise IdentifierError(f"Versión de UUID no soportada: {version}. Disponibles: 4, 7")
+
+
+def generate_random128() -> str:
+    """
+    128 bits aleatorios en base64url sin padding (22 caracteres).
+    """
+    return base64.urlsafe_b64encode(_pool.take(16)).rstrip(b"=").decode("ascii")
+
+
+def generate_jti(kind: str) -> str:
+    """
+    Genera un identificador para el claim jti: uuid4, uuid7 o random128.
+    """
+    if kind == "uuid4":
+        return generate_uuid_v4()
+    if kind == "uuid7":
+        return generate_uuid_v7()
+    if kind == "random128":
+        return generate_random128()
+    raise IdentifierError(f"Tipo de jti inválido '{kind}'. Disponibles: {', '.join(JTI_KINDS)}")
 
 
 def format_uuid(value: str, upper: bool = False, no_hyphen: bool = False) -> str:
@@ -31,3 +168,12 @@ def format_uuid(value: str, upper: bool = False, no_hyphen: bool = False) -> str
     """
     normalized = value.replace("-", "") if no_hyphen else value
     return normalized.upper() if upper else normalized
+
+
+def _reset_after_fork() -> None:
+    _pool.reset()
+    _uuid_v7.reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+import base64
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from jwtgen.domain.claims import ClaimError, render_payload_from_template
+
+
+_PLACEHOLDER = object()
+
+
+@dataclass(frozen=True)
+class PayloadSkeleton:
+    """
+    Payload pre-serializado para firmas en lote: template + claims fijos quedan como
+    fragmentos JSON ya codificados y por token solo se serializan los valores
+    variables, que se intercalan entre los fragmentos.
+
+    El resultado es byte a byte igual a serializar el dict de
+    render_payload_from_template con las mismas opciones de json.dumps.
+    """
+
+    fragments: Tuple[bytes, ...]
+    variable_claims: Tuple[str, ...]
+    fixed_payload: Dict[str, Any]
+    claim_order: Tuple[str, ...]
+    aliases: Dict[str, str]
+    sort_keys: bool
+    ensure_ascii: bool
+    # Encoder reutilizado: json.dumps con argumentos crea un JSONEncoder por llamada.
+    _encode: Callable[[Any], str] = field(repr=False, compare=False, default=json.dumps)
+
+    @classmethod
+    def build(
+        cls,
+        template: Dict[str, Any],
+        standard_claims: Dict[str, Any],
+        variable_claims: Sequence[str] = (),
+        aliases: Optional[Dict[str, str]] = None,
+        sort_keys: bool = False,
+        ensure_ascii: bool = True,
+    ) -> "PayloadSkeleton":
+        """
+        - standard_claims: claims estándar fijos del lote (iss, aud)
+        - variable_claims: claims extra que cambian por token (sub/iat/exp siempre son variables)
+        """
+        aliases = dict(aliases or {})
+        standard = {
+            "iss": standard_claims.get("iss"),
+            "sub": _PLACEHOLDER,
+            "aud": standard_claims.get("aud"),
+            "iat": _PLACEHOLDER,
+            "exp": _PLACEHOLDER,
+        }
+        extra = {k: _PLACEHOLDER for k in variable_claims}
+        # Mismo orden de claves que el camino por dict (template, estándar, extra).
+        ordered = render_payload_from_template(template=template, standard_claims=standard, extra_claims=extra)
+
+        items = [(aliases.get(k, k), k, v) for k, v in ordered.items()]
+        if len({name for name, _, _ in items}) != len(items):
+            raise ClaimError("Aliases generan claims duplicados en el payload.")
+        if sort_keys:
+            items.sort(key=lambda item: item[0])
+
+        fragments: List[bytes] = []
+        slots: List[str] = []
+        current = "{"
+        for i, (name, claim, value) in enumerate(items):
+            if i:
+                current += ","
+            current += json.dumps(name, ensure_ascii=ensure_ascii) + ":"
+            if value is _PLACEHOLDER:
+                fragments.append(current.encode("utf-8"))
+                slots.append(claim)
+                current = ""
+            else:
+                current += json.dumps(value, separators=(",", ":"), sort_keys=sort_keys, ensure_ascii=ensure_ascii)
+        fragments.append((current + "}").encode("utf-8"))
+
+        fixed_payload = {k: v for k, v in ordered.items() if v is not _PLACEHOLDER}
+        return cls(
+            fragments=tuple(fragments),
+            variable_claims=tuple(slots),
+            fixed_payload=fixed_payload,
+            claim_order=tuple(ordered.keys()),
+            aliases=aliases,
+            sort_keys=sort_keys,
+            ensure_ascii=ensure_ascii,
+            _encode=json.JSONEncoder(separators=(",", ":"), sort_keys=sort_keys, ensure_ascii=ensure_ascii).encode,
+        )
+
+    def render_json(self, values: Dict[str, Any]) -> bytes:
+        """
+        JSON del payload para un token. `values` debe traer exactamente los claims variables.
+        """
+        if len(values) != len(self.variable_claims):
+            missing = sorted(set(self.variable_claims) - set(values))
+            unexpected = sorted(set(values) - set(self.variable_claims))
+            raise ClaimError(f"Claims variables no coinciden con el skeleton (faltan {missing}, sobran {unexpected}).")
+
+        fragments = self.fragments
+        encode = self._encode
+        parts: List[bytes] = [fragments[0]]
+        for i, claim in enumerate(self.variable_claims, start=1):
+            try:
+                value = values[claim]
+            except KeyError:
+                raise ClaimError(f"Falta claim variable '{claim}'.") from None
+            parts.append(encode(value).encode("utf-8"))
+            parts.append(fragments[i])
+        return b"".join(parts)
+
+    def encode_segment(self, values: Dict[str, Any]) -> bytes:
+        """
+        Segmento base64url (sin padding) del payload para un token.
+        """
+        return base64.urlsafe_b64encode(self.render_json(values)).rstrip(b"=")
+
+    def payload_dict(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Dict equivalente (con aliases aplicados) para informar en SignResult.payload.
+        """
+        fixed = self.fixed_payload
+        aliases = self.aliases
+        return {
+            aliases.get(k, k): (fixed[k] if k in fixed else values[k])
+            for k in self.claim_order
+        }
@@ -1,21 +1,31 @@
 from __future__ import annotations
 
+import copy
 import json
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
+
+from jwtgen.common.file_cache import FileStatCache
 
 
 class TemplateError(Exception):
     pass
 
 
+# Claims que los verificadores esperan con su nombre registrado: no admiten alias.
+_NON_ALIASABLE_CLAIMS = {"iss", "sub", "aud", "iat", "exp", "nbf", "jti"}
+
+
 class PayloadTemplateRepository:
     """
     Carga templates JSON desde un directorio (por defecto configs/payloads).
+    Los templates se cachean por stat: solo se vuelven a leer si cambian en disco.
     """
 
     def __init__(self, base_dir: str = "configs/payloads") -> None:
         self._base = Path(base_dir)
+        self._cache: FileStatCache[Dict[str, Any]] = FileStatCache()
+        self._aliases_cache: FileStatCache[Dict[str, str]] = FileStatCache()
 
     def load(self, template_name: str) -> Dict[str, Any]:
         if not template_name:
@@ -25,6 +35,55 @@ class PayloadTemplateRepository:
         if not path.exists():
             raise TemplateError(f"No existe template: {path}")
 
+        # Copia profunda: el dict cacheado no debe compartirse con los payloads emitidos.
+        return copy.deepcopy(self._cache.get(path, self._read_template))
+
+    def cache_stats(self) -> Tuple[int, int]:
+        """
+        (hits, misses) acumulados de templates y aliases.
+        """
+        return (
+            self._cache.hits + self._aliases_cache.hits,
+            self._cache.misses + self._aliases_cache.misses,
+        )
+
+    def load_aliases(self, template_name: str) -> Dict[str, str]:
+        """
+        Aliases opcionales de claims para el modo compacto, definidos junto al
+        template en <name>.aliases.json (ej: {"channel": "ch"}). Sin archivo: {}.
+        """
+        if not template_name:
+            raise TemplateError("template_name vacío")
+
+        path = self._base / f"{template_name}.aliases.json"
+        if not path.exists():
+            return {}
+
+        return self._aliases_cache.get(path, self._read_aliases)
+
+    @staticmethod
+    def _read_aliases(path: Path) -> Dict[str, str]:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except Exception as e:
+            raise TemplateError(f"Aliases JSON inválido ({path}): {e}") from e
+
+        if not isinstance(data, dict) or not all(
+            isinstance(k, str) and isinstance(v, str) and v for k, v in data.items()
+        ):
+            raise TemplateError(f"Aliases debe ser un JSON object claim -> alias (strings): {path}")
+
+        reserved = sorted((set(data.keys()) | set(data.values())) & _NON_ALIASABLE_CLAIMS)
+        if reserved:
+            raise TemplateError(f"Aliases no puede renombrar ni usar claims registrados {reserved}: {path}")
+
+        if len(set(data.values())) != len(data):
+            raise TemplateError(f"Aliases duplicados: {path}")
+
+        return data
+
+    @staticmethod
+    def _read_template(path: Path) -> Dict[str, Any]:
         try:
             data = json.loads(path.read_text(encoding="utf-8"))
         except Exception as e:
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import re
+import json
+import base64
+import binascii
+import zlib
+from typing import Any, Dict
+
+
+class TokenDecodeError(Exception):
+    pass
+
+
+# Header JSON siempre empieza con '{"' -> "eyJ" en base64url. El payload puede venir
+# comprimido (zip=DEF), así que no se exige "eyJ" en el segundo segmento.
+# El lookbehind evita reconocer la cola de un token como si fuera uno nuevo.
+JWT_BYTES_PATTERN = re.compile(rb"(?<![A-Za-z0-9_.\-])eyJ[A-Za-z0-9_\-]+\.[A-Za-z0-9_\-]+\.[A-Za-z0-9_\-]*")
+
+
+def b64url_decode(segment: bytes) -> bytes:
+    try:
+        return base64.urlsafe_b64decode(segment + b"=" * (-len(segment) % 4))
+    except (binascii.Error, ValueError) as e:
+        raise TokenDecodeError(f"Segmento base64url inválido: {e}") from e
+
+
+def decode_payload_segment(segment: bytes) -> Dict[str, Any]:
+    """
+    Decodifica el payload (segundo segmento) de un JWT SIN verificar la firma.
+    Soporta payloads comprimidos con DEFLATE crudo (zip=DEF).
+    """
+    raw = b64url_decode(segment)
+    if not raw.startswith(b"{"):
+        try:
+            raw = zlib.decompress(raw, -zlib.MAX_WBITS)
+        except zlib.error as e:
+            raise TokenDecodeError(f"Payload no es JSON ni DEFLATE: {e}") from e
+
+    try:
+        payload = json.loads(raw)
+    except ValueError as e:
+        raise TokenDecodeError(f"Payload JSON inválido: {e}") from e
+
+    if not isinstance(payload, dict):
+        raise TokenDecodeError("Payload debe ser un JSON object.")
+    return payload
+
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import datetime
+import json
+from pathlib import Path
+
+import yaml
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from cryptography.hazmat.primitives.serialization import Encoding, NoEncryption, PrivateFormat
+from cryptography.x509.oid import NameOID
+
+
+def generate_private_key(kind: str = "rsa"):
+    if kind == "ec":
+        return ec.generate_private_key(ec.SECP256R1())
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def self_signed_cert(private_key) -> x509.Certificate:
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "jwtgen-test")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(private_key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(private_key, hashes.SHA256())
+    )
+
+
+def one_line(pem: bytes) -> str:
+    return "".join(pem.decode("ascii").splitlines())
+
+
+def private_pem_one_line(private_key) -> str:
+    return one_line(private_key.private_bytes(Encoding.PEM, PrivateFormat.PKCS8, NoEncryption()))
+
+
+def cert_pem_one_line(cert: x509.Certificate) -> str:
+    return one_line(cert.public_bytes(Encoding.PEM))
+
+
+def write_signing_workspace(base, template: dict | None = None):
+    """
+    Crea en `base` un envs.yaml (qa/admin) y configs/payloads/generic.json.
+    Retorna la llave privada usada.
+    """
+    base = Path(base)
+    private_key = generate_private_key("rsa")
+    (base / "configs" / "payloads").mkdir(parents=True)
+    (base / "configs" / "payloads" / "generic.json").write_text(
+        json.dumps(template if template is not None else {"scope": "read"}), encoding="utf-8"
+    )
+    (base / "envs.yaml").write_text(
+        yaml.safe_dump(
+            {
+                "environments": {
+                    "qa": {
+                        "issuer_default": "JRSC0001",
+                        "profiles": {
+                            "admin": {
+                                "audience_default": "example-api.com",
+                                "keys": {
+                                    "public_cer": cert_pem_one_line(self_signed_cert(private_key)),
+                                    "private_pem": private_pem_one_line(private_key),
+                                },
+                            }
+                        },
+                    }
+                }
+            }
+        ),
+        encoding="utf-8",
+    )
+    return private_key
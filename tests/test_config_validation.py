@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import yaml
+
+from _keys import cert_pem_one_line, generate_private_key, private_pem_one_line, self_signed_cert
+from jwtgen.application.config_validation import ConfigValidationService
+from jwtgen.config.loader import ConfigError
+
+
+class TestConfigValidation(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        rsa_key = generate_private_key("rsa")
+        other_rsa_key = generate_private_key("rsa")
+        ec_key = generate_private_key("ec")
+
+        def profile(cert_key, private_key, alg: str = "RS256") -> dict:
+            return {
+                "audience_default": "example-api.com",
+                "alg": alg,
+                "keys": {
+                    "public_cer": cert_pem_one_line(self_signed_cert(cert_key)),
+                    "private_pem": private_pem_one_line(private_key),
+                },
+            }
+
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls.config_path = str(Path(cls._tmp.name) / "envs.yaml")
+        Path(cls.config_path).write_text(
+            yaml.safe_dump(
+                {
+                    "environments": {
+                        "qa": {
+                            "issuer_default": "JRSC0001",
+                            "profiles": {
+                                "ok": profile(rsa_key, rsa_key),
+                                "mismatch": profile(other_rsa_key, rsa_key),
+                                "wrong-alg": profile(ec_key, ec_key, alg="RS256"),
+                                "ec-alg": profile(ec_key, ec_key, alg="ES256"),
+                                "ps-alg": profile(rsa_key, rsa_key, alg="PS256"),
+                                "two-sources": {
+                                    "audience_default": "example-api.com",
+                                    "keys": {
+                                        "public_cer": cert_pem_one_line(self_signed_cert(rsa_key)),
+                                        "private_pem": private_pem_one_line(rsa_key),
+                                        "private_pem_file": "key.pem",
+                                    },
+                                },
+                                "broken": {
+                                    "audience_default": "example-api.com",
+                                    "keys": {
+                                        "public_cer": "-----BEGIN CERTIFICATE-----AAAA-----END CERTIFICATE-----",
+                                        "private_pem": private_pem_one_line(rsa_key),
+                                    },
+                                },
+                            },
+                        }
+                    }
+                }
+            ),
+            encoding="utf-8",
+        )
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls._tmp.cleanup()
+
+    def _results(self, workers: int) -> dict:
+        results = ConfigValidationService(workers=workers).validate(self.config_path)
+        return {r.profile: r for r in results}
+
+    def test_validate_reports_each_profile(self) -> None:
+        results = self._results(workers=1)
+        self.assertTrue(results["ok"].ok)
+        # Solo RS256 es firmable por el pipeline; otros alg se rechazan aunque la llave sea compatible.
+        self.assertFalse(results["ec-alg"].ok)
+        self.assertIn("no soportado", results["ec-alg"].error)
+        self.assertFalse(results["ps-alg"].ok)
+        self.assertIn("no soportado", results["ps-alg"].error)
+        self.assertFalse(results["mismatch"].ok)
+        self.assertIn("no corresponde", results["mismatch"].error)
+        self.assertFalse(results["wrong-alg"].ok)
+        self.assertIn("RS256", results["wrong-alg"].error)
+        self.assertFalse(results["broken"].ok)
+        self.assertTrue(all(r.elapsed_ms >= 0 for r in results.values()))
+
+    def test_schema_errors_are_reported_per_profile(self) -> None:
+        results = self._results(workers=1)
+        self.assertEqual(len(results), 7)
+        self.assertFalse(results["two-sources"].ok)
+        self.assertIn("exactamente uno de private_pem", results["two-sources"].error)
+        self.assertTrue(results["ok"].ok)
+
+    def test_broken_structure_fails_whole_run(self) -> None:
+        path = Path(self._tmp.name) / "bad-structure.yaml"
+        path.write_text(yaml.safe_dump({"environments": {"qa": {"profiles": ["admin"]}}}), encoding="utf-8")
+        with self.assertRaises(ConfigError):
+            ConfigValidationService(workers=1).validate(str(path))
+
+    def test_validate_in_process_pool_matches_inline(self) -> None:
+        inline = self._results(workers=1)
+        pooled = self._results(workers=2)
+        self.assertEqual(
+            {k: (r.ok, r.error) for k, r in inline.items()},
+            {k: (r.ok, r.error) for k, r in pooled.items()},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+import threading
 import unittest
 import uuid
 
 from jwtgen.domain.identifiers import (
     IdentifierError,
+    UuidV7Generator,
     format_uuid,
+    generate_jti,
+    generate_random128,
+    generate_uuid_batch,
     generate_uuid_v4,
     generate_uuid_v4_batch,
+    generate_uuid_v7,
 )
 
 
@@ -27,6 +33,45 @@ class TestIdentifiers(unittest.TestCase):
         with self.assertRaises(IdentifierError):
             generate_uuid_v4_batch(0)
 
+    def test_generate_uuid_v7_has_rfc4122_variant_and_v7(self) -> None:
+        parsed = uuid.UUID(generate_uuid_v7())
+        self.assertEqual(parsed.version, 7)
+        self.assertEqual(parsed.variant, uuid.RFC_4122)
+
+    def test_uuid_v7_batch_is_strictly_increasing(self) -> None:
+        values = generate_uuid_batch(5000, version=7)
+        self.assertEqual(values, sorted(values))
+        self.assertEqual(len(set(values)), len(values))
+
+    def test_uuid_v7_is_unique_and_monotonic_across_threads(self) -> None:
+        generator = UuidV7Generator()
+        results = []
+
+        def worker() -> None:
+            results.append(generator.generate_batch(1000))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        values = [v for batch in results for v in batch]
+        self.assertEqual(len(set(values)), 4000)
+        for batch in results:
+            self.assertEqual(batch, sorted(batch))
+
+    def test_generate_uuid_batch_invalid_version(self) -> None:
+        with self.assertRaises(IdentifierError):
+            generate_uuid_batch(1, version=5)
+
+    def test_generate_jti_kinds(self) -> None:
+        self.assertEqual(uuid.UUID(generate_jti("uuid4")).version, 4)
+        self.assertEqual(uuid.UUID(generate_jti("uuid7")).version, 7)
+        self.assertEqual(len(generate_random128()), 22)
+        with self.assertRaises(IdentifierError):
+            generate_jti("serial")
+
     def test_format_uuid(self) -> None:
         value = "123e4567-e89b-12d3-a456-426614174000"
         self.assertEqual(format_uuid(value, upper=True), value.upper())
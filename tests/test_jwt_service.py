@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import jwt
+import yaml
+from cryptography.hazmat.primitives.serialization import Encoding, NoEncryption, PrivateFormat
+
+from _keys import self_signed_cert, write_signing_workspace
+from jwtgen.application.dto import SignJwtRequest
+from jwtgen.application.jwt_service import JwtService, JwtServiceError
+
+
+class TestJwtServiceBatch(unittest.TestCase):
+    def setUp(self) -> None:
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        private_key = self.private_key = write_signing_workspace(
+            self._tmp.name, template={"scope": "read", "channel": "admin", "meta": {"app": "niño"}}
+        )
+        self.public_key = private_key.public_key()
+        self.service = JwtService()
+
+    def tearDown(self) -> None:
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def _request(self, sub: str, **kwargs) -> SignJwtRequest:
+        return SignJwtRequest(config_path="envs.yaml", env="qa", profile="admin", sub=sub, **kwargs)
+
+    def test_batch_matches_single_signing(self) -> None:
+        requests = [
+            self._request("user_1"),
+            self._request("user_2", extra_claims={"scope": "admin", "tenant": 7}),
+            self._request("user_3", extra_claims={"scope": "write", "tenant": 8}, ttl="5m"),
+            self._request("user_4", compact=True),
+            self._request("user_5", compress=True),
+        ]
+        with mock.patch("jwtgen.domain.claims.now_epoch", return_value=1700000000):
+            batch = self.service.sign_rs256_batch(requests)
+            single = [self.service.sign_rs256(r) for r in requests]
+
+        self.assertEqual(len(batch), len(requests))
+        for batch_result, single_result in zip(batch, single):
+            self.assertEqual(batch_result.payload, single_result.payload)
+            self.assertEqual(batch_result.header, single_result.header)
+            if "zip" not in batch_result.header:
+                decoded = jwt.decode(
+                    batch_result.token,
+                    self.public_key,
+                    algorithms=["RS256"],
+                    audience="example-api.com",
+                    options={"verify_exp": False},
+                )
+                self.assertEqual(decoded, single_result.payload)
+
+        # Mismo payload serializado que PyJWT en el modo por defecto.
+        self.assertEqual(batch[0].token.split(".")[:2], single[0].token.split(".")[:2])
+
+    def test_generated_jti_is_unique_in_single_and_batch(self) -> None:
+        requests = [self._request(f"user_{i}", jti="uuid7") for i in range(20)]
+        batch = self.service.sign_rs256_batch(requests)
+        single = self.service.sign_rs256(self._request("user_x", jti="random128"))
+
+        jtis = [r.payload["jti"] for r in batch]
+        self.assertEqual(len(set(jtis)), 20)
+        self.assertEqual(jtis, sorted(jtis))
+        self.assertEqual(len(single.payload["jti"]), 22)
+
+    def test_jti_cannot_be_set_twice(self) -> None:
+        with self.assertRaises(JwtServiceError):
+            self.service.sign_rs256(self._request("user_1", jti="uuid4", extra_claims={"jti": "fixed"}))
+
+    def test_mutating_a_returned_payload_does_not_leak_into_next_token(self) -> None:
+        first = self.service.sign_rs256(self._request("user_1"))
+        first.payload["meta"]["app"] = "MUTATED"
+
+        second = self.service.sign_rs256(self._request("user_2"))
+        self.assertEqual(second.payload["meta"], {"app": "niño"})
+        decoded = jwt.decode(
+            second.token, self.public_key, algorithms=["RS256"], audience="example-api.com",
+            options={"verify_exp": False},
+        )
+        self.assertEqual(decoded["meta"], {"app": "niño"})
+
+    def test_batch_rejects_reserved_extra_claims(self) -> None:
+        with self.assertRaises(JwtServiceError):
+            self.service.sign_rs256_batch([self._request("user_1", extra_claims={"sub": "other"})])
+
+
+    def test_cached_config_resolves_key_files_independently_of_cwd(self) -> None:
+        keys_dir = os.path.join(self._tmp.name, "keys")
+        os.mkdir(keys_dir)
+        with open(os.path.join(keys_dir, "qa.cer"), "wb") as f:
+            f.write(self_signed_cert(self.private_key).public_bytes(Encoding.PEM))
+        with open(os.path.join(keys_dir, "qa.pem"), "wb") as f:
+            f.write(self.private_key.private_bytes(Encoding.PEM, PrivateFormat.PKCS8, NoEncryption()))
+        with open("envs.yaml", encoding="utf-8") as f:
+            config = yaml.safe_load(f)
+        config["environments"]["qa"]["profiles"]["admin"]["keys"] = {
+            "public_cer_file": "keys/qa.cer",
+            "private_pem_file": "keys/qa.pem",
+        }
+        with open("envs.yaml", "w", encoding="utf-8") as f:
+            yaml.safe_dump(config, f)
+
+        self.service.sign_rs256(self._request("user_1"))
+
+        # Otro cwd con templates pero sin llaves: el config cacheado debe seguir resolviendo keys/ junto al YAML.
+        other = os.path.join(self._tmp.name, "other")
+        os.makedirs(os.path.join(other, "configs", "payloads"))
+        with open(os.path.join(other, "configs", "payloads", "generic.json"), "w", encoding="utf-8") as f:
+            f.write("{}")
+        config_path = os.path.abspath("envs.yaml")
+        os.chdir(other)
+
+        result = self.service.sign_rs256(
+            SignJwtRequest(config_path=os.path.relpath(config_path), env="qa", profile="admin", sub="user_2")
+        )
+        self.assertEqual(result.payload["sub"], "user_2")
+
+
+if __name__ == "__main__":
+    unittest.main()
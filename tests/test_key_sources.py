@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import base64
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import yaml
+from cryptography.hazmat.primitives.serialization import Encoding, NoEncryption, PrivateFormat
+
+from _keys import cert_pem_one_line, generate_private_key, private_pem_one_line, self_signed_cert
+from jwtgen.config.loader import ConfigError, ConfigLoader
+from jwtgen.crypto.key_material import KeyMaterialError, verify_key_pair
+from jwtgen.crypto.key_sources import (
+    KEY_SOURCE_ENV,
+    KEY_SOURCE_FILE,
+    KeyReference,
+    load_key_material_from_references,
+    read_key_reference,
+)
+
+
+class TestKeySources(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.private_key = generate_private_key("rsa")
+        cls.cert = self_signed_cert(cls.private_key)
+
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.base = Path(self._tmp.name)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _write_config(self, keys: dict) -> str:
+        path = self.base / "envs.yaml"
+        path.write_text(
+            yaml.safe_dump(
+                {
+                    "environments": {
+                        "qa": {
+                            "issuer_default": "JRSC0001",
+                            "profiles": {"admin": {"audience_default": "example-api.com", "keys": keys}},
+                        }
+                    }
+                }
+            ),
+            encoding="utf-8",
+        )
+        return str(path)
+
+    def test_file_references_are_relative_to_config_and_support_der(self) -> None:
+        (self.base / "keys").mkdir()
+        (self.base / "keys" / "qa.cer").write_bytes(self.cert.public_bytes(Encoding.DER))
+        (self.base / "keys" / "qa.pem").write_bytes(
+            self.private_key.private_bytes(Encoding.PEM, PrivateFormat.PKCS8, NoEncryption())
+        )
+        config = self._write_config({"public_cer_file": "keys/qa.cer", "private_pem_file": "keys/qa.pem"})
+
+        resolved = ConfigLoader(config).resolve(env="qa", profile="admin")
+        self.assertEqual(resolved.private_pem.kind, KEY_SOURCE_FILE)
+        self.assertEqual(Path(resolved.private_pem.value), (self.base / "keys" / "qa.pem").resolve())
+
+        keys = load_key_material_from_references(resolved.public_cer, resolved.private_pem)
+        verify_key_pair(keys)
+
+    def test_pem_with_leading_text_is_loaded_as_pem(self) -> None:
+        prefix = b"Bag Attributes\n    localKeyID: 01 02 03\nsubject=CN = jwtgen-test\n"
+        (self.base / "qa.cer").write_bytes(prefix + self.cert.public_bytes(Encoding.PEM))
+        (self.base / "qa.pem").write_bytes(
+            prefix + self.private_key.private_bytes(Encoding.PEM, PrivateFormat.PKCS8, NoEncryption())
+        )
+
+        keys = load_key_material_from_references(
+            KeyReference(kind=KEY_SOURCE_FILE, value=str(self.base / "qa.cer")),
+            KeyReference(kind=KEY_SOURCE_FILE, value=str(self.base / "qa.pem")),
+        )
+        verify_key_pair(keys)
+
+    def test_env_references_accept_pem_and_base64_der(self) -> None:
+        der = self.cert.public_bytes(Encoding.DER)
+        for encoded in (base64.b64encode(der), base64.encodebytes(der)):
+            env = {
+                "JWTGEN_TEST_CER": encoded.decode("ascii"),
+                "JWTGEN_TEST_KEY": private_pem_one_line(self.private_key),
+            }
+            with self.subTest(wrapped=b"\n" in encoded.strip()), mock.patch.dict(os.environ, env):
+                keys = load_key_material_from_references(
+                    KeyReference(kind=KEY_SOURCE_ENV, value="JWTGEN_TEST_CER"),
+                    KeyReference(kind=KEY_SOURCE_ENV, value="JWTGEN_TEST_KEY"),
+                )
+                verify_key_pair(keys)
+
+    def test_missing_env_reference_raises(self) -> None:
+        with mock.patch.dict(os.environ, {}, clear=True):
+            with self.assertRaises(KeyMaterialError):
+                read_key_reference(KeyReference(kind=KEY_SOURCE_ENV, value="JWTGEN_TEST_MISSING"))
+
+    def test_file_reference_reloads_when_file_changes(self) -> None:
+        path = self.base / "key.pem"
+        path.write_bytes(b"first")
+        ref = KeyReference(kind=KEY_SOURCE_FILE, value=str(path))
+        self.assertEqual(read_key_reference(ref), b"first")
+
+        path.write_bytes(b"second-version")
+        self.assertEqual(read_key_reference(ref), b"second-version")
+
+    def test_keys_require_exactly_one_source(self) -> None:
+        config = self._write_config(
+            {
+                "public_cer": cert_pem_one_line(self.cert),
+                "public_cer_file": "keys/qa.cer",
+                "private_pem": private_pem_one_line(self.private_key),
+            }
+        )
+        with self.assertRaises(ConfigError):
+            ConfigLoader(config).load()
+
+        config = self._write_config({"public_cer": cert_pem_one_line(self.cert)})
+        with self.assertRaises(ConfigError):
+            ConfigLoader(config).load()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from _keys import write_signing_workspace
+from jwtgen.application.dto import SignJwtRequest
+from jwtgen.application.jwt_service import JwtService, JwtServiceError
+from jwtgen.application.metrics import MetricsRegistry
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_prometheus_histogram_is_cumulative(self) -> None:
+        registry = MetricsRegistry(latency_buckets=(0.001, 0.01))
+        registry.record_issued("qa", "admin", 0.0005)
+        registry.record_issued("qa", "admin", 0.005)
+        registry.record_issued("qa", "admin", 0.5)
+        registry.record_error("qa", "admin", "ClaimError")
+
+        text = registry.render_prometheus()
+        self.assertIn('jwtgen_tokens_issued_total{env="qa",profile="admin"} 3', text)
+        self.assertIn('jwtgen_sign_errors_total{env="qa",profile="admin",type="ClaimError"} 1', text)
+        self.assertIn('jwtgen_sign_latency_seconds_bucket{env="qa",profile="admin",le="0.001"} 1', text)
+        self.assertIn('jwtgen_sign_latency_seconds_bucket{env="qa",profile="admin",le="0.01"} 2', text)
+        self.assertIn('jwtgen_sign_latency_seconds_bucket{env="qa",profile="admin",le="+Inf"} 3', text)
+        self.assertIn('jwtgen_sign_latency_seconds_count{env="qa",profile="admin"} 3', text)
+
+    def test_per_thread_shards_are_merged(self) -> None:
+        registry = MetricsRegistry(latency_buckets=(0.001,))
+
+        def worker() -> None:
+            for _ in range(1000):
+                registry.record_issued("qa", "admin", 0.0005)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        registry.record_issued("qa", "admin", 0.5)
+
+        latency = registry.snapshot()["sign_latency_seconds"][0]
+        self.assertEqual(latency["count"], 4001)
+        self.assertEqual(latency["counts"], [4000, 1])
+        self.assertEqual(registry.snapshot()["tokens_issued"][0]["count"], 4001)
+
+    def test_dead_thread_shards_are_folded(self) -> None:
+        registry = MetricsRegistry(latency_buckets=(0.001,))
+
+        def worker() -> None:
+            for _ in range(10):
+                registry.record_issued("qa", "admin", 0.0005)
+
+        for _ in range(50):
+            threads = [threading.Thread(target=worker) for _ in range(10)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            registry.snapshot()
+
+        latency = registry.snapshot()["sign_latency_seconds"][0]
+        self.assertLessEqual(len(registry._shards), 1)
+        self.assertEqual(latency["count"], 5000)
+        self.assertEqual(latency["counts"], [5000, 0])
+
+    def test_label_values_are_escaped(self) -> None:
+        registry = MetricsRegistry()
+        registry.record_error('q"a', "admin", "ConfigError")
+        self.assertIn('env="q\\"a"', registry.render_prometheus())
+
+    def test_write_prometheus_file(self) -> None:
+        registry = MetricsRegistry()
+        registry.record_issued("qa", "admin", 0.001)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "jwtgen.prom")
+            registry.write_prometheus(path)
+            self.assertIn("jwtgen_tokens_issued_total", Path(path).read_text(encoding="utf-8"))
+
+
+class TestServiceMetrics(unittest.TestCase):
+    def setUp(self) -> None:
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        write_signing_workspace(self._tmp.name)
+
+    def tearDown(self) -> None:
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def test_service_records_tokens_errors_and_cache_hits(self) -> None:
+        registry = MetricsRegistry()
+        service = JwtService(metrics=registry)
+
+        for _ in range(3):
+            service.sign_rs256(SignJwtRequest(config_path="envs.yaml", env="qa", profile="admin", sub="u"))
+        with self.assertRaises(JwtServiceError):
+            service.sign_rs256(SignJwtRequest(config_path="envs.yaml", env="qa", profile="missing", sub="u"))
+        with self.assertRaises(JwtServiceError):
+            service.sign_rs256(
+                SignJwtRequest(config_path="envs.yaml", env="qa", profile="admin", sub="u", ttl="soon")
+            )
+
+        snap = registry.snapshot()
+        self.assertEqual(snap["tokens_issued"], [{"env": "qa", "profile": "admin", "count": 3}])
+        self.assertEqual(
+            {(e["profile"], e["type"]) for e in snap["errors"]},
+            {("missing", "ConfigError"), ("admin", "ClaimError")},
+        )
+        self.assertEqual(snap["caches"]["key"]["misses"], 1)
+        self.assertEqual(snap["caches"]["key"]["hits"], 2)
+        self.assertEqual(snap["caches"]["config"]["misses"], 1)
+        self.assertGreater(snap["caches"]["template"]["hit_ratio"], 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
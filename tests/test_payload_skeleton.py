@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import base64
+import json
+import random
+import string
+import unittest
+
+from jwtgen.crypto.signer import apply_claim_aliases
+from jwtgen.domain.claims import ClaimError, render_payload_from_template
+from jwtgen.domain.payload_skeleton import PayloadSkeleton
+
+
+_KEY_POOL = ["iss", "sub", "aud", "iat", "exp", "scope", "channel", "tenant", "roles", "meta", "ñandú", "k\"q"]
+
+
+def _random_text(rng: random.Random) -> str:
+    alphabet = string.ascii_letters + string.digits + " \"\\/\n\té€😀"
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+
+
+def _random_value(rng: random.Random, depth: int = 0):
+    kinds = ["str", "int", "float", "bool", "none"] + (["list", "dict"] if depth < 2 else [])
+    kind = rng.choice(kinds)
+    if kind == "str":
+        return _random_text(rng)
+    if kind == "int":
+        return rng.randint(-(2**40), 2**40)
+    if kind == "float":
+        return rng.uniform(-1e6, 1e6)
+    if kind == "bool":
+        return rng.random() < 0.5
+    if kind == "none":
+        return None
+    if kind == "list":
+        return [_random_value(rng, depth + 1) for _ in range(rng.randint(0, 3))]
+    return {_random_text(rng): _random_value(rng, depth + 1) for _ in range(rng.randint(0, 3))}
+
+
+def _random_case(rng: random.Random):
+    template = {k: _random_value(rng) for k in rng.sample(_KEY_POOL, rng.randint(0, len(_KEY_POOL)))}
+    standard_fixed = {"iss": _random_text(rng) or "iss", "aud": _random_text(rng) or "aud"}
+    extra_pool = [k for k in _KEY_POOL if k not in {"iss", "sub", "aud", "iat", "exp"}] + ["x1", "x2"]
+    extra_keys = rng.sample(extra_pool, rng.randint(0, 4))
+    aliases = {k: f"a_{k}" for k in extra_pool if rng.random() < 0.3}
+    return template, standard_fixed, extra_keys, aliases
+
+
+class TestPayloadSkeleton(unittest.TestCase):
+    def test_equivalent_to_dict_path_for_random_inputs(self) -> None:
+        rng = random.Random(20261019)
+        for _ in range(500):
+            template, standard_fixed, extra_keys, aliases = _random_case(rng)
+            compact = rng.random() < 0.5
+            skeleton = PayloadSkeleton.build(
+                template=template,
+                standard_claims=standard_fixed,
+                variable_claims=extra_keys,
+                aliases=aliases if compact else None,
+                sort_keys=compact,
+                ensure_ascii=not compact,
+            )
+
+            for _ in range(3):
+                values = {"sub": _random_text(rng) or "s", "iat": rng.randint(0, 2**31), "exp": rng.randint(0, 2**32)}
+                extra = {k: _random_value(rng) for k in extra_keys}
+                values.update(extra)
+
+                standard = {"iss": standard_fixed["iss"], "sub": values["sub"], "aud": standard_fixed["aud"],
+                            "iat": values["iat"], "exp": values["exp"]}
+                payload = render_payload_from_template(template=template, standard_claims=standard, extra_claims=extra)
+                if compact:
+                    payload = apply_claim_aliases(payload, aliases)
+                    expected = json.dumps(payload, separators=(",", ":"), sort_keys=True, ensure_ascii=False)
+                else:
+                    expected = json.dumps(payload, separators=(",", ":"))
+
+                rendered = skeleton.render_json(values)
+                self.assertEqual(rendered, expected.encode("utf-8"))
+                self.assertEqual(skeleton.payload_dict(values), payload)
+
+                segment = skeleton.encode_segment(values)
+                self.assertNotIn(b"=", segment)
+                self.assertEqual(base64.urlsafe_b64decode(segment + b"=" * (-len(segment) % 4)), rendered)
+
+    def test_rejects_reserved_variable_claims_and_mismatched_values(self) -> None:
+        with self.assertRaises(ClaimError):
+            PayloadSkeleton.build(template={}, standard_claims={"iss": "i", "aud": "a"}, variable_claims=["iss"])
+
+        skeleton = PayloadSkeleton.build(template={}, standard_claims={"iss": "i", "aud": "a"}, variable_claims=["jti"])
+        with self.assertRaises(ClaimError):
+            skeleton.render_json({"sub": "s", "iat": 1, "exp": 2})
+        with self.assertRaises(ClaimError):
+            skeleton.render_json({"sub": "s", "iat": 1, "exp": 2, "other": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
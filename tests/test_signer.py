@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import base64
+import json
+import tempfile
+import unittest
+import zlib
+from pathlib import Path
+
+import jwt
+
+from _keys import generate_private_key
+from jwtgen.crypto.key_material import KeyMaterial
+from jwtgen.crypto.signer import CompactOptions, JwtSignError, Rs256JwtSigner
+from jwtgen.domain.templates import PayloadTemplateRepository, TemplateError
+
+
+def _segment(token: str, index: int) -> bytes:
+    part = token.split(".")[index]
+    return base64.urlsafe_b64decode(part + "=" * (-len(part) % 4))
+
+
+class TestCompactSigner(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        private_key = generate_private_key("rsa")
+        cls.keys = KeyMaterial(public_key=private_key.public_key(), private_key=private_key)
+        cls.signer = Rs256JwtSigner()
+        cls.payload = {
+            "sub": "user_123",
+            "iss": "JRSC0001",
+            "aud": "example-api.com",
+            "iat": 1700000000,
+            "exp": 1700003600,
+            "channel": "admin",
+            "scope": "auth",
+            "meta": {"app": "administración", "roles": ["read", "write"] * 10},
+        }
+
+    def test_compact_is_verifiable_sorted_and_reports_size(self) -> None:
+        default = self.signer.sign(payload=self.payload, keys=self.keys)
+        compact = self.signer.sign(payload=self.payload, keys=self.keys, compact=CompactOptions())
+
+        decoded = jwt.decode(
+            compact.token, self.keys.public_key, algorithms=["RS256"], audience="example-api.com",
+            options={"verify_exp": False},
+        )
+        self.assertEqual(decoded, self.payload)
+        self.assertEqual(list(json.loads(_segment(compact.token, 1))), sorted(self.payload))
+        self.assertEqual(compact.size_report.baseline_bytes, len(default.token))
+        self.assertEqual(compact.size_report.final_bytes, len(compact.token))
+        self.assertGreater(compact.size_report.saved_bytes, 0)
+
+    def test_aliases_and_deflate(self) -> None:
+        result = self.signer.sign(
+            payload=self.payload,
+            keys=self.keys,
+            compact=CompactOptions(aliases={"channel": "ch", "scope": "scp"}, compress=True),
+        )
+        self.assertEqual(result.header["zip"], "DEF")
+        claims = json.loads(zlib.decompress(_segment(result.token, 1), -zlib.MAX_WBITS))
+        self.assertEqual(claims["ch"], "admin")
+        self.assertEqual(claims["scp"], "auth")
+        self.assertNotIn("channel", claims)
+        self.assertLess(result.size_report.final_bytes, result.size_report.baseline_bytes)
+
+    def test_deflate_skipped_when_not_smaller(self) -> None:
+        result = self.signer.sign(payload={"sub": "u"}, keys=self.keys, compact=CompactOptions(compress=True))
+        self.assertNotIn("zip", result.header)
+
+    def test_alias_collision_raises(self) -> None:
+        with self.assertRaises(JwtSignError):
+            self.signer.sign(
+                payload=self.payload, keys=self.keys, compact=CompactOptions(aliases={"channel": "scope"})
+            )
+
+    def test_template_aliases_reject_registered_claims(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            repo = PayloadTemplateRepository(base_dir=tmp)
+            self.assertEqual(repo.load_aliases("generic"), {})
+
+            Path(tmp, "generic.aliases.json").write_text(json.dumps({"channel": "ch"}), encoding="utf-8")
+            self.assertEqual(repo.load_aliases("generic"), {"channel": "ch"})
+
+            Path(tmp, "other.aliases.json").write_text(json.dumps({"sub": "s"}), encoding="utf-8")
+            with self.assertRaises(TemplateError):
+                repo.load_aliases("other")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import io
+import json
+import unittest
+
+from jwtgen.application.dto import SignJwtRequest
+from jwtgen.application.jwt_service import JwtServiceError
+from jwtgen.application.stdio_server import StdioSignServer
+from jwtgen.crypto.signer import SignResult
+
+
+class _FakeService:
+    def __init__(self) -> None:
+        self.requests = []
+
+    def sign_rs256(self, req: SignJwtRequest) -> SignResult:
+        self.requests.append(req)
+        if req.profile == "missing":
+            raise JwtServiceError("Profile 'missing' no existe")
+        payload = {"sub": req.sub, **req.extra_claims}
+        return SignResult(token=f"token-{req.sub}", header={}, payload=payload)
+
+
+_DEFAULTS = SignJwtRequest(config_path="envs.yaml", env="qa", profile="admin", sub="", ttl="1h")
+
+
+def _serve(lines, workers: int = 1):
+    service = _FakeService()
+    out = io.StringIO()
+    count = StdioSignServer(defaults=_DEFAULTS, service=service, workers=workers).serve(
+        io.StringIO("\n".join(lines) + "\n"), out
+    )
+    responses = [json.loads(line) for line in out.getvalue().splitlines()]
+    return count, responses, service
+
+
+class TestStdioSignServer(unittest.TestCase):
+    def test_one_response_per_request_with_id_correlation(self) -> None:
+        count, responses, service = _serve(
+            [
+                json.dumps({"id": 1, "sub": "a"}),
+                "",
+                "not json",
+                json.dumps({"id": "x", "sub": "b", "extra_claims": {"role": "admin"}, "ttl": "5m"}),
+                json.dumps({"id": 3, "sub": "c", "unknown": True}),
+                json.dumps({"id": 4}),
+                json.dumps({"id": 5, "sub": "d", "profile": "missing"}),
+            ]
+        )
+
+        self.assertEqual(count, 6)
+        self.assertEqual(responses[0], {"id": 1, "ok": True, "token": "token-a", "payload": {"sub": "a"}})
+        self.assertEqual(responses[1]["id"], None)
+        self.assertFalse(responses[1]["ok"])
+        self.assertEqual(responses[2]["payload"], {"sub": "b", "role": "admin"})
+        self.assertEqual([(r["id"], r["ok"]) for r in responses[3:]], [(3, False), (4, False), (5, False)])
+        self.assertIn("sub", responses[4]["error"])
+
+        # Los campos no enviados se toman de los defaults de la línea de comandos.
+        self.assertEqual(service.requests[0].ttl, "1h")
+        self.assertEqual(service.requests[1].ttl, "5m")
+        self.assertEqual(service.requests[1].env, "qa")
+
+    def test_rejects_wrong_field_types(self) -> None:
+        cases = [
+            ({"sub": "a", "compact": "false"}, "compact"),
+            ({"sub": "a", "compress": 1}, "compress"),
+            ({"sub": "a", "exp": "abc"}, "exp"),
+            ({"sub": "a", "exp": True}, "exp"),
+            ({"sub": "a", "extra_claims": ["x"]}, "extra_claims"),
+            ({"sub": 123}, "sub"),
+            ({"sub": "a", "ttl": 60}, "ttl"),
+            ({"sub": "a", "compact": None}, "compact"),
+        ]
+        lines = [json.dumps({"id": i, **data}) for i, (data, _) in enumerate(cases)]
+        _, responses, service = _serve(lines)
+
+        self.assertEqual(service.requests, [])
+        for (_, field_name), response in zip(cases, responses):
+            self.assertFalse(response["ok"])
+            self.assertIn(f"'{field_name}'", response["error"])
+
+    def test_accepts_valid_typed_fields(self) -> None:
+        line = json.dumps({"id": 1, "sub": "a", "exp": 1893456000, "compact": True, "aud": None})
+        _, responses, service = _serve([line])
+
+        self.assertTrue(responses[0]["ok"])
+        self.assertEqual(service.requests[0].exp, 1893456000)
+        self.assertIs(service.requests[0].compact, True)
+
+    def test_worker_pool_answers_every_request(self) -> None:
+        lines = [json.dumps({"id": i, "sub": f"user_{i}"}) for i in range(200)]
+        count, responses, _ = _serve(lines, workers=4)
+
+        self.assertEqual(count, 200)
+        self.assertEqual(sorted(r["id"] for r in responses), list(range(200)))
+        self.assertTrue(all(r["token"] == f"token-user_{r['id']}" for r in responses))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import time
+import unittest
+
+from jwtgen.application.dto import SignJwtRequest
+from jwtgen.application.jwt_service import JwtServiceError
+from jwtgen.application.token_refresher import TokenRefresher
+from jwtgen.crypto.signer import SignResult
+
+
+class _FakeService:
+    def __init__(self, ttl: float = 0.2) -> None:
+        self.ttl = ttl
+        self.calls = 0
+        self.fail = False
+
+    def sign_rs256(self, req: SignJwtRequest) -> SignResult:
+        self.calls += 1
+        if self.fail:
+            raise JwtServiceError("boom")
+        iat = time.time()
+        payload = {"sub": req.sub, "iat": iat, "exp": iat + self.ttl, "n": self.calls}
+        return SignResult(token=f"token-{self.calls}", header={}, payload=payload)
+
+
+def _request(sub: str = "user_1", **extra) -> SignJwtRequest:
+    return SignJwtRequest(config_path="envs.yaml", env="qa", profile="admin", sub=sub, extra_claims=extra)
+
+
+class TestTokenRefresher(unittest.TestCase):
+    def test_get_reuses_current_token(self) -> None:
+        service = _FakeService(ttl=60)
+        with TokenRefresher(service=service) as refresher:
+            first = refresher.get(_request())
+            second = refresher.get(_request())
+            other = refresher.get(_request(scope="admin"))
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(service.calls, 2)
+
+    def test_refreshes_in_background_before_exp(self) -> None:
+        service = _FakeService(ttl=0.2)
+        with TokenRefresher(service=service, refresh_fraction=0.5) as refresher:
+            first = refresher.get(_request())
+            deadline = time.time() + 2
+            while service.calls < 3 and time.time() < deadline:
+                time.sleep(0.01)
+            current = refresher.get(_request())
+
+        self.assertGreaterEqual(service.calls, 3)
+        self.assertNotEqual(first.token, current.token)
+        self.assertGreater(current.payload["exp"], time.time() - 0.2)
+
+    def test_refresh_errors_go_to_callback(self) -> None:
+        errors = []
+        service = _FakeService(ttl=1.0)
+        refresher = TokenRefresher(
+            service=service,
+            refresh_fraction=0.1,
+            retry_interval=0.05,
+            on_error=lambda req, e: errors.append((req.sub, str(e))),
+        )
+        try:
+            first = refresher.get(_request())
+            service.fail = True
+            deadline = time.time() + 2
+            while not errors and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertIs(refresher.get(_request()), first)
+        finally:
+            refresher.stop()
+
+        self.assertEqual(errors[0], ("user_1", "boom"))
+
+    def test_rejects_absolute_exp(self) -> None:
+        refresher = TokenRefresher(service=_FakeService())
+        req = SignJwtRequest(config_path="envs.yaml", env="qa", profile="admin", sub="u", exp=1893456000)
+        with self.assertRaises(JwtServiceError):
+            refresher.get(req)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import base64
+import json
+import tempfile
+import unittest
+import zlib
+from pathlib import Path
+
+from jwtgen.application.token_scanner import MAX_TOKEN_BYTES, TokenScanner
+from jwtgen.domain.token_decoding import TokenDecodeError, decode_payload_segment
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _token(payload: dict, compress: bool = False) -> str:
+    header = _b64(json.dumps({"alg": "RS256", "typ": "JWT"}).encode())
+    body = json.dumps(payload).encode()
+    if compress:
+        c = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS)
+        body = c.compress(body) + c.flush()
+    return f"{header}.{_b64(body)}.c2lnbmF0dXJl"
+
+
+class TestTokenDecoding(unittest.TestCase):
+    def test_decode_plain_and_deflated_payload(self) -> None:
+        payload = {"sub": "u1", "exp": 10}
+        for compress in (False, True):
+            segment = _token(payload, compress=compress).split(".")[1].encode()
+            self.assertEqual(decode_payload_segment(segment), payload)
+
+    def test_decode_invalid_payload(self) -> None:
+        with self.assertRaises(TokenDecodeError):
+            decode_payload_segment(b"bm90LWpzb24")
+
+
+class TestTokenScanner(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = str(Path(self._tmp.name) / "gateway.log")
+
+        lines = []
+        self.expected = []
+        for i in range(3000):
+            payload = {"sub": f"user_{i}", "exp": 1000 + i * 10, "aud": "api-a" if i % 3 else ["api-a", "api-b"]}
+            self.expected.append({"sub": payload["sub"], "exp": payload["exp"]})
+            lines.append(f"2026-01-01T00:00:00Z GET /v1/items auth=Bearer {_token(payload)} status=200")
+        lines.append("noise eyJhbGciOiJub25lIn0.bm90LWpzb24.x")
+        Path(self.path).write_text("\n".join(lines), encoding="utf-8")
+        self.assertGreater(Path(self.path).stat().st_size, 3 * MAX_TOKEN_BYTES)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _scan(self, workers: int, chunk_bytes: int) -> tuple:
+        scanner = TokenScanner(claims=("sub", "exp"), workers=workers, chunk_bytes=chunk_bytes, bucket_seconds=10000, now=15000)
+        records = list(scanner.scan([self.path]))
+        return records, scanner.stats
+
+    def test_records_and_stats_across_chunk_boundaries(self) -> None:
+        records, stats = self._scan(workers=1, chunk_bytes=MAX_TOKEN_BYTES)
+
+        self.assertEqual(records, self.expected)
+        self.assertEqual(stats.tokens, 3000)
+        self.assertEqual(stats.invalid, 1)
+        self.assertEqual(stats.expired, 1401)
+        self.assertEqual(stats.exp_histogram, {0: 900, 10000: 1000, 20000: 1000, 30000: 100})
+        self.assertEqual(stats.aud_counts, {"api-a": 3000, "api-b": 1000})
+
+    def test_process_pool_matches_single_pass(self) -> None:
+        single = self._scan(workers=1, chunk_bytes=1 << 30)
+        pooled = self._scan(workers=2, chunk_bytes=MAX_TOKEN_BYTES)
+        self.assertEqual(single[0], pooled[0])
+        self.assertEqual(single[1].to_dict(10000), pooled[1].to_dict(10000))
+
+
+if __name__ == "__main__":
+    unittest.main()